@@ -15,28 +15,55 @@ Features:
 Decision log:
   - Using boto3 with S3-compatible API for R2
   - ETag comparison for incremental uploads
-  - Multipart upload with 100MB chunks for large files
-  - 4 concurrent threads balances speed vs memory
+  - Single PUT up to 200MB (simple MD5 ETag), multipart with 32MB chunks above
+  - 32 concurrent part threads saturate high-bandwidth links
+  - Remote state from one paginated listing, not a HEAD request per file
+  - Change checks run on a thread pool (hashing is CPU/disk-bound)
+  - One shared transfer manager for all files: threads are reused across
+    files and small files interleave with the parts of large ones
+  - Local ETags cached by (size, mtime_ns) so unchanged files are not re-hashed;
+    --force ignores the cache but merges into it rather than overwriting it
+  - Bucket-side manifest.json of uploaded files: while its ETag matches the
+    local copy, files unchanged since then skip all remote checks
+  - Multipart uploads carry SHA-256 metadata when already computed (ETag
+    depends on part size); files > 1 GB skip hashing when size matches and
+    not modified since upload, so large files are read once per upload
 Date: 2024-12-09
 """
 
 import hashlib
+import json
+import mmap
+import os
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 
 import boto3
 import click
-from boto3.s3.transfer import TransferConfig
+from boto3.s3.transfer import TransferConfig, create_transfer_manager
+from botocore.config import Config
 from botocore.exceptions import ClientError
+from s3transfer.futures import TransferFuture
+from s3transfer.manager import TransferManager
+from s3transfer.subscribers import BaseSubscriber
 from tqdm import tqdm
 
 from .utils.config import get_processed_path
 from .utils.r2_config import r2_config
 
+# Threads hashing multipart ETag parts concurrently
+ETAG_HASH_WORKERS = 4
 
-class UploadProgress:
-    """Callback for tracking upload progress."""
+# Object metadata (x-amz-meta-*) holding the SHA-256 of multipart uploads,
+# whose ETag depends on the part size used at upload time
+SHA256_METADATA_KEY = "local-sha256"
+
+
+class UploadProgress(BaseSubscriber):
+    """Transfer subscriber for tracking upload progress."""
 
     def __init__(self, filename: str, total_size: int):
         self.filename = filename
@@ -50,22 +77,29 @@ class UploadProgress:
             leave=False,
         )
 
-    def __call__(self, bytes_transferred: int):
+    def on_progress(self, future, bytes_transferred: int, **kwargs):
         self.uploaded += bytes_transferred
         self.pbar.update(bytes_transferred)
 
-    def close(self):
+    def on_done(self, future, **kwargs):
         self.pbar.close()
 
 
-def get_s3_client():
-    """Create boto3 S3 client configured for R2."""
+def get_s3_client(max_pool_connections: int = 10):
+    """
+    Create boto3 S3 client configured for R2.
+
+    Args:
+        max_pool_connections: HTTP connection pool size. Size it to the number
+            of threads sharing the client, or threads queue for connections.
+    """
     return boto3.client(
         "s3",
         endpoint_url=r2_config.endpoint,
         aws_access_key_id=r2_config.R2_ACCESS_KEY_ID,
         aws_secret_access_key=r2_config.R2_SECRET_ACCESS_KEY,
         region_name="auto",
+        config=Config(max_pool_connections=max_pool_connections),
     )
 
 
@@ -121,114 +155,378 @@ def compute_etag(filepath: Path, chunk_size: int = None) -> str:
 
     if file_size <= r2_config.MULTIPART_THRESHOLD:
         # Single part upload - simple MD5
-        md5 = hashlib.md5()
         with open(filepath, "rb") as f:
-            for chunk in iter(lambda: f.read(8192), b""):
-                md5.update(chunk)
+            md5 = hashlib.file_digest(f, "md5")
         return f'"{md5.hexdigest()}"'
     else:
-        # Multipart upload - MD5 of part MD5s
-        part_md5s = []
-        with open(filepath, "rb") as f:
-            while True:
-                chunk = f.read(chunk_size)
-                if not chunk:
-                    break
-                part_md5s.append(hashlib.md5(chunk).digest())
+        # Multipart upload - MD5 of part MD5s. Hash zero-copy slices of a
+        # memory map rather than allocating a new buffer per part. MD5 releases
+        # the GIL, so parts hash concurrently and overlap with page-in I/O.
+        with open(filepath, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # Parts are consumed front to back: ask for aggressive read-ahead
+            # and let the kernel drop pages once hashed
+            if hasattr(mmap, "MADV_SEQUENTIAL"):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            with memoryview(mm) as view:
+
+                def hash_part(offset: int) -> bytes:
+                    return hashlib.md5(view[offset : offset + chunk_size]).digest()
+
+                with ThreadPoolExecutor(max_workers=ETAG_HASH_WORKERS) as executor:
+                    part_md5s = list(executor.map(hash_part, range(0, file_size, chunk_size)))
 
         combined_md5 = hashlib.md5(b"".join(part_md5s)).hexdigest()
         return f'"{combined_md5}-{len(part_md5s)}"'
 
 
-def get_remote_etag(client, key: str) -> Optional[str]:
-    """Get ETag of existing object in R2, or None if not found."""
+def get_etag_cache_path() -> Path:
+    """Path of the local ETag cache (sidecar to the processed data)."""
+    return get_processed_path() / ".r2_etag_cache.json"
+
+
+def load_etag_cache() -> dict[str, dict]:
+    """Load cached local digests: str(path) -> {size, mtime_ns, etag, sha256}."""
+    cache_path = get_etag_cache_path()
+    if not cache_path.exists():
+        return {}
     try:
-        response = client.head_object(Bucket=r2_config.R2_BUCKET, Key=key)
-        return response.get("ETag")
+        return json.loads(cache_path.read_text())
+    except json.JSONDecodeError:
+        return {}
+
+
+def save_etag_cache(cache: dict[str, dict]) -> None:
+    """Save local ETag cache to disk."""
+    cache_path = get_etag_cache_path()
+
+    # Write atomically via temp file
+    temp_file = cache_path.with_suffix(".tmp")
+    temp_file.write_text(json.dumps(cache))
+    temp_file.rename(cache_path)
+
+
+def compute_sha256(filepath: Path) -> str:
+    """Compute the SHA-256 hex digest of a file (hardware-accelerated where available)."""
+    with open(filepath, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+DIGEST_FUNCTIONS = {
+    "etag": compute_etag,
+    "sha256": compute_sha256,
+}
+
+
+def get_local_digest(
+    local_path: Path,
+    kind: str = "etag",
+    cache: Optional[dict[str, dict]] = None,
+    stat: Optional[os.stat_result] = None,
+) -> str:
+    """
+    Get a local digest ("etag" or "sha256"), reusing the cached value if the
+    file is unchanged.
+
+    A file counts as unchanged when its size and mtime_ns match the cache entry.
+    Pass `stat` when the caller already has it to save a syscall.
+    """
+    compute = DIGEST_FUNCTIONS[kind]
+    if cache is None:
+        return compute(local_path)
+
+    entry = get_cache_entry(local_path, cache, stat)
+    if kind not in entry:
+        entry[kind] = compute(local_path)
+    return entry[kind]
+
+
+def get_cache_entry(
+    local_path: Path,
+    cache: dict[str, dict],
+    stat: Optional[os.stat_result] = None,
+) -> dict:
+    """Get the digest cache entry for a file, resetting it if the file changed."""
+    if stat is None:
+        stat = local_path.stat()
+    key = str(local_path)
+    entry = cache.get(key)
+    if not entry or entry["size"] != stat.st_size or entry["mtime_ns"] != stat.st_mtime_ns:
+        entry = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        cache[key] = entry
+    return entry
+
+
+def get_remote_head(client, key: str) -> Optional[dict]:
+    """Get HEAD response of existing object in R2, or None if not found."""
+    try:
+        return client.head_object(Bucket=r2_config.R2_BUCKET, Key=key)
     except ClientError as e:
         if e.response["Error"]["Code"] == "404":
             return None
         raise
 
 
-def file_needs_upload(client, local_path: Path, r2_key: str, force: bool = False) -> bool:
-    """Check if a file needs to be uploaded (changed or missing)."""
+def get_manifest_key() -> str:
+    """R2 key of the upload manifest."""
+    return f"{r2_config.R2_PREFIX}/manifest.json"
+
+
+def get_manifest_cache_path() -> Path:
+    """Path of the local copy of the last uploaded manifest."""
+    return get_processed_path() / ".r2_manifest.json"
+
+
+def load_trusted_manifest(client) -> Optional[dict[str, dict]]:
+    """
+    Load the manifest written by the last successful run, if still valid.
+
+    The local copy is trusted only while the bucket's manifest ETag matches
+    the one recorded when it was written; anything else may have changed the
+    bucket since. Costs a single HEAD request.
+
+    Returns: r2_key -> {size, mtime_ns, etag}, or None
+    """
+    cache_path = get_manifest_cache_path()
+    if not cache_path.exists():
+        return None
+    try:
+        local = json.loads(cache_path.read_text())
+    except json.JSONDecodeError:
+        return None
+
+    head = get_remote_head(client, get_manifest_key())
+    if head is None or head.get("ETag") != local.get("etag"):
+        return None
+    return local["files"]
+
+
+def save_manifest(
+    client,
+    manifest: Optional[dict[str, dict]],
+    files: list[tuple[Path, str, int]],
+    etag_cache: dict[str, dict],
+) -> None:
+    """Record the uploaded state of `files` in the bucket and locally."""
+    manifest = dict(manifest or {})
+    for local_path, r2_key, size in files:
+        manifest[r2_key] = {
+            "size": size,
+            "mtime_ns": local_path.stat().st_mtime_ns,
+            "etag": etag_cache.get(str(local_path), {}).get("etag"),
+        }
+
+    response = client.put_object(
+        Bucket=r2_config.R2_BUCKET,
+        Key=get_manifest_key(),
+        Body=json.dumps(manifest).encode(),
+        ContentType="application/json",
+        CacheControl="no-cache",
+    )
+
+    # Write atomically via temp file
+    cache_path = get_manifest_cache_path()
+    temp_file = cache_path.with_suffix(".tmp")
+    temp_file.write_text(json.dumps({"etag": response["ETag"], "files": manifest}))
+    temp_file.rename(cache_path)
+
+
+def split_by_manifest(
+    files: list[tuple[Path, str, int]],
+    manifest: dict[str, dict],
+) -> tuple[list[tuple[Path, str, int]], list[tuple[Path, str, int]]]:
+    """
+    Split files into (pending, unchanged) against a trusted manifest.
+
+    A file is unchanged when its size and mtime_ns match its manifest entry;
+    pending files still need a full change check.
+    """
+    pending = []
+    unchanged = []
+    for local_path, r2_key, size in files:
+        entry = manifest.get(r2_key)
+        if entry and entry["size"] == size and entry["mtime_ns"] == local_path.stat().st_mtime_ns:
+            unchanged.append((local_path, r2_key, size))
+        else:
+            pending.append((local_path, r2_key, size))
+    return pending, unchanged
+
+
+def get_remote_inventory(client, prefix: str) -> dict[str, dict]:
+    """
+    List all objects under a prefix in one paginated scan.
+
+    Returns: key -> {ETag, ContentLength, LastModified} (HEAD response field
+    names), replacing one HEAD request per file with ~1 request per 1000 keys.
+    """
+    inventory = {}
+    paginator = client.get_paginator("list_objects_v2")
+
+    for page in paginator.paginate(Bucket=r2_config.R2_BUCKET, Prefix=prefix):
+        for obj in page.get("Contents", []):
+            inventory[obj["Key"]] = {
+                "ETag": obj.get("ETag"),
+                "ContentLength": obj.get("Size"),
+                "LastModified": obj.get("LastModified"),
+            }
+
+    return inventory
+
+
+def file_needs_upload(
+    client,
+    local_path: Path,
+    r2_key: str,
+    force: bool = False,
+    etag_cache: Optional[dict[str, dict]] = None,
+    inventory: Optional[dict[str, dict]] = None,
+) -> bool:
+    """
+    Check if a file needs to be uploaded (changed or missing).
+
+    Remote state comes from the inventory when given, else a HEAD request.
+    Checks in order of cost:
+      1. Size differs from the remote object: changed, no hashing needed
+      2. Very large files: not modified since the remote upload
+      3. Multipart objects carrying local-sha256 metadata: compare SHA-256
+      4. Otherwise: compare the S3-style MD5 ETag
+    """
     if force:
         return True
 
-    remote_etag = get_remote_etag(client, r2_key)
-    if remote_etag is None:
+    if inventory is not None:
+        remote = inventory.get(r2_key)
+    else:
+        remote = get_remote_head(client, r2_key)
+    if remote is None:
+        return True
+
+    stat = local_path.stat()
+    if remote.get("ContentLength") != stat.st_size:
         return True
 
-    local_etag = compute_etag(local_path)
-    return local_etag != remote_etag
+    if stat.st_size > r2_config.STAT_COMPARE_THRESHOLD:
+        last_modified = remote.get("LastModified")
+        local_mtime = datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc)
+        if last_modified and local_mtime <= last_modified:
+            return False
 
+    # Listings omit user metadata, so multipart objects ("<md5>-<parts>" ETag)
+    # still need a HEAD to read their SHA-256
+    if "Metadata" not in remote and "-" in (remote.get("ETag") or ""):
+        remote = get_remote_head(client, r2_key) or remote
 
-def upload_file(
+    remote_sha256 = remote.get("Metadata", {}).get(SHA256_METADATA_KEY)
+    if remote_sha256:
+        return get_local_digest(local_path, "sha256", etag_cache, stat) != remote_sha256
+
+    local_etag = get_local_digest(local_path, "etag", etag_cache, stat)
+    return local_etag != remote.get("ETag")
+
+
+def check_files(
     client,
-    local_path: Path,
-    r2_key: str,
-    dry_run: bool = False,
-    verbose: bool = False,
-) -> tuple[bool, int]:
+    files: list[tuple[Path, str, int]],
+    force: bool = False,
+    max_workers: int = 16,
+    desc: Optional[str] = None,
+    etag_cache: Optional[dict[str, dict]] = None,
+    inventory: Optional[dict[str, dict]] = None,
+) -> tuple[list[tuple[Path, str, int]], list[tuple[Path, str, int]]]:
     """
-    Upload a single file to R2.
+    Check files for changes concurrently.
+
+    Hashing and any remaining HEAD requests run on a thread pool sharing
+    the (thread-safe) boto3 client.
 
-    Returns: (success, bytes_uploaded)
+    Returns: (changed, unchanged) lists of (local_path, r2_key, size) tuples
     """
-    file_size = local_path.stat().st_size
-    content_type = r2_config.get_content_type(local_path.name)
-    cache_control = r2_config.get_cache_control(r2_key)
+    changed: list[tuple[Path, str, int]] = []
+    unchanged: list[tuple[Path, str, int]] = []
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(
+                file_needs_upload, client, local_path, r2_key, force, etag_cache, inventory
+            ): (local_path, r2_key, size)
+            for local_path, r2_key, size in files
+        }
+        completed = as_completed(futures)
+        if desc:
+            completed = tqdm(completed, total=len(futures), desc=desc, leave=False)
+
+        for future in completed:
+            if future.result():
+                changed.append(futures[future])
+            else:
+                unchanged.append(futures[future])
+
+    return changed, unchanged
 
-    if dry_run:
-        if verbose:
-            size_mb = file_size / (1024 * 1024)
-            print(f"  Would upload: {local_path.name} ({size_mb:.1f} MB) -> {r2_key}")
-        return True, file_size
 
-    # Configure transfer for large files
-    transfer_config = TransferConfig(
+def get_transfer_config(max_concurrency: Optional[int] = None) -> TransferConfig:
+    """Transfer settings shared by all uploads."""
+    return TransferConfig(
         multipart_threshold=r2_config.MULTIPART_THRESHOLD,
         multipart_chunksize=r2_config.MULTIPART_CHUNKSIZE,
-        max_concurrency=r2_config.MULTIPART_MAX_CONCURRENCY,
+        max_concurrency=max_concurrency or r2_config.MULTIPART_MAX_CONCURRENCY,
+        io_chunksize=r2_config.MULTIPART_IO_CHUNKSIZE,
         use_threads=True,
     )
 
+
+def submit_upload(
+    manager: TransferManager,
+    local_path: Path,
+    r2_key: str,
+    file_size: int,
+    etag_cache: Optional[dict[str, dict]] = None,
+) -> TransferFuture:
+    """
+    Queue a single file upload on a shared transfer manager.
+
+    Args:
+        etag_cache: Local digest cache. Multipart uploads carry SHA-256
+            metadata only if the change check already computed it: hashing
+            here would read the whole file a second time just before the
+            upload reads it again.
+
+    Returns: Transfer future; result() raises if the upload failed
+    """
     extra_args = {
-        "ContentType": content_type,
-        "CacheControl": cache_control,
+        "ContentType": r2_config.get_content_type(local_path.name),
+        "CacheControl": r2_config.get_cache_control(r2_key),
     }
+    if file_size > r2_config.MULTIPART_THRESHOLD and etag_cache is not None:
+        sha256 = get_cache_entry(local_path, etag_cache).get("sha256")
+        if sha256:
+            extra_args["Metadata"] = {SHA256_METADATA_KEY: sha256}
+
+    # Show progress for large files
+    subscribers = []
+    if file_size > r2_config.PROGRESS_THRESHOLD:
+        subscribers.append(UploadProgress(str(local_path), file_size))
+
+    return manager.upload(
+        str(local_path),
+        r2_config.R2_BUCKET,
+        r2_key,
+        extra_args=extra_args,
+        subscribers=subscribers,
+    )
 
-    try:
-        # Show progress for large files
-        if file_size > r2_config.PROGRESS_THRESHOLD:
-            progress = UploadProgress(str(local_path), file_size)
-            client.upload_file(
-                str(local_path),
-                r2_config.R2_BUCKET,
-                r2_key,
-                Config=transfer_config,
-                ExtraArgs=extra_args,
-                Callback=progress,
-            )
-            progress.close()
-        else:
-            client.upload_file(
-                str(local_path),
-                r2_config.R2_BUCKET,
-                r2_key,
-                Config=transfer_config,
-                ExtraArgs=extra_args,
-            )
-        return True, file_size
-
-    except Exception as e:
-        print(f"  ERROR uploading {local_path.name}: {e}")
-        return False, 0
-
-
-def collect_files(dataset: str) -> list[tuple[Path, str]]:
-    """Collect all files for a dataset, returning (local_path, r2_key) tuples."""
+
+def scan_files(directory: str) -> Iterator[tuple[str, int]]:
+    """Recursively yield (path, size) of files, using os.DirEntry's cached stat."""
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from scan_files(entry.path)
+            elif entry.is_file(follow_symlinks=False):
+                yield entry.path, entry.stat(follow_symlinks=False).st_size
+
+
+def collect_files(dataset: str) -> list[tuple[Path, str, int]]:
+    """Collect all files for a dataset, returning (local_path, r2_key, size) tuples."""
     mappings = get_upload_mappings()
     mapping = mappings.get(dataset)
     if not mapping:
@@ -240,12 +538,11 @@ def collect_files(dataset: str) -> list[tuple[Path, str]]:
     if not local_dir.exists():
         return []
 
+    # Sizes come from the scan so sorting and uploading don't stat() again
     files = []
-    for local_path in local_dir.rglob("*"):
-        if local_path.is_file():
-            relative = local_path.relative_to(local_dir)
-            r2_key = f"{r2_prefix}/{relative}"
-            files.append((local_path, r2_key))
+    for path, size in scan_files(str(local_dir)):
+        relative = os.path.relpath(path, local_dir)
+        files.append((Path(path), f"{r2_prefix}/{relative}", size))
 
     return files
 
@@ -312,7 +609,27 @@ def get_bucket_size(client) -> int:
 )
 @click.option("-v", "--verbose", is_flag=True, help="Verbose output")
 @click.option("--test-only", is_flag=True, help="Scan files only, don't connect to R2")
-def main(dry_run: bool, force: bool, only: tuple, verbose: bool, test_only: bool):
+@click.option(
+    "--check-concurrency",
+    default=16,
+    show_default=True,
+    help="Concurrent change checks against R2",
+)
+@click.option(
+    "--concurrency",
+    default=r2_config.MULTIPART_MAX_CONCURRENCY,
+    show_default=True,
+    help="Concurrent upload requests (files and parts)",
+)
+def main(
+    dry_run: bool,
+    force: bool,
+    only: tuple,
+    verbose: bool,
+    test_only: bool,
+    check_concurrency: int,
+    concurrency: int,
+):
     """Upload processed data to Cloudflare R2."""
     print("=" * 60)
     print("UPLOAD TO R2")
@@ -342,7 +659,7 @@ def main(dry_run: bool, force: bool, only: tuple, verbose: bool, test_only: bool
 
     # Collect all files to upload
     print("[1/4] Scanning files...")
-    all_files: list[tuple[Path, str]] = []
+    all_files: list[tuple[Path, str, int]] = []
 
     for dataset in datasets:
         files = collect_files(dataset)
@@ -355,7 +672,7 @@ def main(dry_run: bool, force: bool, only: tuple, verbose: bool, test_only: bool
         for extra in get_extra_files():
             local_path = extra["local"]
             if local_path.exists():
-                all_files.append((local_path, extra["r2_key"]))
+                all_files.append((local_path, extra["r2_key"], local_path.stat().st_size))
                 if verbose:
                     print(f"  extra: {local_path.name}")
 
@@ -375,7 +692,10 @@ def main(dry_run: bool, force: bool, only: tuple, verbose: bool, test_only: bool
     # Initialize S3 client
     print()
     print("[2/4] Connecting to R2...")
-    client = get_s3_client()
+    # One connection per concurrent check/upload, plus part threads of large files
+    client = get_s3_client(
+        max(check_concurrency, concurrency, r2_config.MULTIPART_MAX_CONCURRENCY)
+    )
 
     # Verify bucket access
     try:
@@ -390,12 +710,28 @@ def main(dry_run: bool, force: bool, only: tuple, verbose: bool, test_only: bool
     # Check which files need uploading
     print()
     print("[3/4] Checking for changes...")
-    to_upload: list[tuple[Path, str]] = []
+    to_upload: list[tuple[Path, str, int]] = []
     skipped = 0
 
+    # Reuse local ETags of files unchanged since the last run
+    etag_cache = {} if force else load_etag_cache()
+
+    # Files untouched since the last run's manifest need no remote checks
+    manifest = None if force else load_trusted_manifest(client)
+    pending = all_files
+    if manifest is not None:
+        pending, unchanged = split_by_manifest(all_files, manifest)
+        skipped += len(unchanged)
+        print(f"  Unchanged since last upload (manifest): {len(unchanged)} files")
+
+    # One bucket listing instead of a HEAD request per file
+    inventory = None
+    if pending and not force:
+        inventory = get_remote_inventory(client, r2_config.R2_PREFIX)
+
     # Group files by type for progress display
     file_groups: dict[str, list] = {}
-    for local_path, r2_key in all_files:
+    for local_path, r2_key, size in pending:
         # Determine group for progress
         if "basemap" in r2_key:
             group = "basemap"
@@ -408,33 +744,35 @@ def main(dry_run: bool, force: bool, only: tuple, verbose: bool, test_only: bool
 
         if group not in file_groups:
             file_groups[group] = []
-        file_groups[group].append((local_path, r2_key))
+        file_groups[group].append((local_path, r2_key, size))
 
     for group, files in file_groups.items():
-        if len(files) > 10:
-            # Show progress for groups with many files
-            pbar = tqdm(files, desc=f"  Checking {group}", leave=False)
-            for local_path, r2_key in pbar:
-                if file_needs_upload(client, local_path, r2_key, force):
-                    to_upload.append((local_path, r2_key))
-                else:
-                    skipped += 1
-            pbar.close()
-        else:
-            for local_path, r2_key in files:
-                if file_needs_upload(client, local_path, r2_key, force):
-                    to_upload.append((local_path, r2_key))
-                    if verbose:
-                        print(f"  Changed: {local_path.name}")
-                else:
-                    skipped += 1
-                    if verbose:
-                        print(f"  Unchanged: {local_path.name}")
+        # Show progress for groups with many files
+        desc = f"  Checking {group}" if len(files) > 10 else None
+        changed, unchanged = check_files(
+            client, files, force, check_concurrency, desc, etag_cache, inventory
+        )
+        to_upload.extend(changed)
+        skipped += len(unchanged)
+
+        if verbose and desc is None:
+            for local_path, _, _ in changed:
+                print(f"  Changed: {local_path.name}")
+            for local_path, _, _ in unchanged:
+                print(f"  Unchanged: {local_path.name}")
+
+    # --force started from an empty cache: merge so digests of files this run
+    # didn't hash stay cached instead of wiping the file
+    save_etag_cache({**load_etag_cache(), **etag_cache} if force else etag_cache)
 
     print(f"  To upload: {len(to_upload)} files")
     print(f"  Skipped (unchanged): {skipped} files")
 
     if not to_upload:
+        # Record the verified state so the next run can skip the checks
+        if pending and not dry_run:
+            save_manifest(client, manifest, all_files, etag_cache)
+
         print()
         print("=" * 60)
         print("NO CHANGES - all files are up to date")
@@ -450,19 +788,37 @@ def main(dry_run: bool, force: bool, only: tuple, verbose: bool, test_only: bool
     failed_count = 0
     failed_files: list[str] = []
 
-    # Sort to upload large files first (basemap)
-    to_upload.sort(key=lambda x: x[0].stat().st_size, reverse=True)
+    # Large files (basemap) are queued first so their parts start early; one
+    # shared transfer manager interleaves them with the small files, reusing
+    # its thread pool across files.
+    to_upload.sort(key=lambda x: x[2], reverse=True)
 
-    for local_path, r2_key in to_upload:
-        success, size = upload_file(client, local_path, r2_key, dry_run, verbose)
-        if success:
+    if dry_run:
+        for local_path, r2_key, size in to_upload:
+            if verbose:
+                size_mb = size / (1024 * 1024)
+                print(f"  Would upload: {local_path.name} ({size_mb:.1f} MB) -> {r2_key}")
             uploaded_count += 1
             uploaded_bytes += size
-            if not dry_run and local_path.stat().st_size <= r2_config.PROGRESS_THRESHOLD:
-                print(f"  Uploaded: {local_path.name}")
-        else:
-            failed_count += 1
-            failed_files.append(str(local_path))
+    else:
+        with create_transfer_manager(client, get_transfer_config(concurrency)) as manager:
+            futures = [
+                (submit_upload(manager, local_path, r2_key, size, etag_cache), local_path, size)
+                for local_path, r2_key, size in to_upload
+            ]
+            for future, local_path, size in futures:
+                try:
+                    future.result()
+                except Exception as e:
+                    print(f"  ERROR uploading {local_path.name}: {e}")
+                    failed_count += 1
+                    failed_files.append(str(local_path))
+                    continue
+
+                uploaded_count += 1
+                uploaded_bytes += size
+                if size <= r2_config.PROGRESS_THRESHOLD:
+                    print(f"  Uploaded: {local_path.name}")
 
     # Summary
     print()
@@ -483,6 +839,7 @@ def main(dry_run: bool, force: bool, only: tuple, verbose: bool, test_only: bool
 
     # Verify and report bucket size
     if not dry_run:
+        save_manifest(client, manifest, all_files, etag_cache)
         verify_uploads(client, verbose)
 
         print()
@@ -14,30 +14,88 @@ import json
 from pathlib import Path
 
 import duckdb
+import pandas as pd
 import streamlit as st
 
 # Data directory
 DATA_DIR = Path(__file__).parent.parent / "data" / "processed" / "cities"
 VALIDATION_REPORT = DATA_DIR / "validation_report.json"
 
+# Max rows sent to the city browser table
+DISPLAY_LIMIT = 5000
 
-@st.cache_data
-def load_table(filename: str):
-    """Load a parquet file using DuckDB."""
+
+def file_mtime(filename: str) -> int | None:
+    """Modification time of a file in DATA_DIR (ns), used as a cache key."""
     path = DATA_DIR / filename
     if not path.exists():
         return None
-    return duckdb.query(f"SELECT * FROM '{path}'").df()
+    return path.stat().st_mtime_ns
 
 
-@st.cache_data
-def load_validation_report():
-    """Load the most recent validation report JSON."""
-    if not VALIDATION_REPORT.exists():
+@st.cache_data(max_entries=64)
+def load_scalar(sql: str, mtime: int | None):
+    """
+    Run an aggregate query and return its single value.
+
+    `mtime` is only part of the cache key, so results refresh when the
+    underlying parquet file is rewritten.
+    """
+    return duckdb.query(sql).fetchone()[0]
+
+
+@st.cache_data(max_entries=64)
+def load_values(sql: str, mtime: int | None) -> list:
+    """
+    Run a single-column query and return its values (e.g. filter options).
+
+    Cached like `load_scalar`: only the small result list is kept, never the
+    table, and `mtime` refreshes it when the parquet file is rewritten.
+    """
+    return [value for (value,) in duckdb.query(sql).fetchall()]
+
+
+@st.cache_resource
+def get_connection():
+    """Shared DuckDB connection for filtered queries against the parquet files."""
+    return duckdb.connect()
+
+
+def parquet_source(filename: str) -> str:
+    """SQL table expression reading a parquet file in DATA_DIR."""
+    return f"read_parquet('{DATA_DIR / filename}', hive_partitioning = false)"
+
+
+@st.cache_data(max_entries=4)
+def read_validation_report(mtime: int | None):
+    """Parse the validation report JSON; `mtime` keys the cache like `load_scalar`."""
+    if mtime is None:
         return None
     return json.loads(VALIDATION_REPORT.read_text())
 
 
+def load_validation_report():
+    """Load the most recent validation report JSON."""
+    return read_validation_report(file_mtime(VALIDATION_REPORT.name))
+
+
+def downcast_for_display(df):
+    """
+    Narrow column dtypes before handing a frame to st.dataframe.
+
+    Streamlit serializes to Arrow on every rerun; categories and 32-bit numbers
+    roughly halve the bytes sent over the websocket.
+    """
+    for col in ("country_code", "region"):
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+    if "ucdb_population_2025" in df.columns:
+        df["ucdb_population_2025"] = pd.to_numeric(df["ucdb_population_2025"], downcast="unsigned")
+    if "ucdb_area_km2_2025" in df.columns:
+        df["ucdb_area_km2_2025"] = df["ucdb_area_km2_2025"].astype("float32")
+    return df
+
+
 def render_summary():
     """Render the Summary tab."""
     st.header("Data Summary")
@@ -56,25 +114,30 @@ def render_summary():
     with col1:
         st.subheader("Table Row Counts")
         for filename, description in tables.items():
-            df = load_table(filename)
-            if df is not None:
-                st.metric(filename, f"{len(df):,} rows")
+            if (DATA_DIR / filename).exists():
+                row_count = load_scalar(
+                    f"SELECT COUNT(*) FROM {parquet_source(filename)}", file_mtime(filename)
+                )
+                st.metric(filename, f"{row_count:,} rows")
             else:
                 st.metric(filename, "Not found", delta="missing")
 
     with col2:
         st.subheader("Quick Stats")
-        cities = load_table("cities.parquet")
-        if cities is not None:
-            st.metric("Countries", cities["country_code"].nunique())
-            st.metric("Regions", cities["region"].nunique())
+        if (DATA_DIR / "cities.parquet").exists():
+            cities = parquet_source("cities.parquet")
+            mtime = file_mtime("cities.parquet")
+            st.metric("Countries", load_scalar(f"SELECT COUNT(DISTINCT country_code) FROM {cities}", mtime))
+            st.metric("Regions", load_scalar(f"SELECT COUNT(DISTINCT region) FROM {cities}", mtime))
 
             # Top population
-            pop = load_table("city_populations.parquet")
-            if pop is not None:
-                pop_2025 = pop[pop["epoch"] == 2025]
-                total_pop = pop_2025["population"].sum()
-                st.metric("Total Urban Pop (2025)", f"{total_pop/1e9:.2f}B")
+            if (DATA_DIR / "city_populations.parquet").exists():
+                total_pop = load_scalar(
+                    f"SELECT SUM(population) FROM {parquet_source('city_populations.parquet')} "
+                    "WHERE epoch = 2025",
+                    file_mtime("city_populations.parquet"),
+                )
+                st.metric("Total Urban Pop (2025)", f"{(total_pop or 0)/1e9:.2f}B")
 
     # Validation status
     st.subheader("Validation Status")
@@ -94,44 +157,74 @@ def render_cities():
     """Render the Cities browser tab."""
     st.header("City Browser")
 
-    cities = load_table("cities.parquet")
-    if cities is None:
+    if not (DATA_DIR / "cities.parquet").exists():
         st.error("cities.parquet not found")
         return
 
-    # Filters
+    # Cursor per script run: Streamlit sessions run on separate threads
+    con = get_connection().cursor()
+    source = parquet_source("cities.parquet")
+    mtime = file_mtime("cities.parquet")
+
+    # Filters (option lists only change when the file does)
     col1, col2, col3 = st.columns(3)
 
     with col1:
-        countries = ["All"] + sorted(cities["country_code"].dropna().unique().tolist())
-        selected_country = st.selectbox("Country", countries)
+        countries = load_values(
+            f"SELECT DISTINCT country_code FROM {source} WHERE country_code IS NOT NULL ORDER BY 1",
+            mtime,
+        )
+        selected_country = st.selectbox("Country", ["All"] + countries)
 
     with col2:
-        regions = ["All"] + sorted(cities["region"].dropna().unique().tolist())
-        selected_region = st.selectbox("Region", regions)
+        regions = load_values(
+            f"SELECT DISTINCT region FROM {source} WHERE region IS NOT NULL ORDER BY 1",
+            mtime,
+        )
+        selected_region = st.selectbox("Region", ["All"] + regions)
 
     with col3:
         search = st.text_input("Search by name")
 
-    # Apply filters
-    filtered = cities.copy()
+    # Push filters down into the parquet scan
+    conditions = []
+    params = []
     if selected_country != "All":
-        filtered = filtered[filtered["country_code"] == selected_country]
+        conditions.append("country_code = ?")
+        params.append(selected_country)
     if selected_region != "All":
-        filtered = filtered[filtered["region"] == selected_region]
+        conditions.append("region = ?")
+        params.append(selected_region)
     if search:
-        filtered = filtered[filtered["name"].str.contains(search, case=False, na=False)]
+        conditions.append("name ILIKE ?")
+        params.append(f"%{search}%")
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
 
     # Display columns
+    available = set(
+        load_values(f"SELECT column_name FROM (DESCRIBE SELECT * FROM {source})", mtime)
+    )
     display_cols = [
         "city_id", "name", "country_code", "region",
         "ucdb_population_2025", "ucdb_area_km2_2025"
     ]
-    display_cols = [c for c in display_cols if c in filtered.columns]
-
-    st.write(f"Showing {len(filtered):,} of {len(cities):,} cities")
+    display_cols = [c for c in display_cols if c in available]
+    order = "ORDER BY ucdb_population_2025 DESC" if "ucdb_population_2025" in available else ""
+
+    # Total row count only changes with the file, not with the filters
+    total = load_scalar(f"SELECT COUNT(*) FROM {source}", mtime)
+    # Match count comes from the same filtered scan (window runs before LIMIT)
+    filtered = con.execute(
+        f"SELECT {', '.join(display_cols)}, COUNT(*) OVER () AS _matched "
+        f"FROM {source} {where} {order} LIMIT {DISPLAY_LIMIT}",
+        params,
+    ).df()
+    matched = int(filtered["_matched"].iloc[0]) if len(filtered) else 0
+    filtered = filtered.drop(columns="_matched")
+
+    st.write(f"Showing {len(filtered):,} of {matched:,} matching ({total:,} cities)")
     st.dataframe(
-        filtered[display_cols].sort_values("ucdb_population_2025", ascending=False),
+        downcast_for_display(filtered),
         use_container_width=True,
         height=500,
     )
@@ -167,7 +260,6 @@ def render_outliers():
         st.write(f"**{len(items)} outliers found**")
 
         # Convert to dataframe for display
-        import pandas as pd
         df = pd.DataFrame(items)
         st.dataframe(df, use_container_width=True, height=400)
 
@@ -15,17 +15,35 @@ Decision log:
   - All thematic layers share ID_UC_G0 as join key
   - Extract schema from XLSX Index for human-readable column names
   - Store geometry separately to keep thematic tables lightweight
+  - Theme layers read via pyogrio's Arrow path with column pushdown and no
+    geometry decode, straight into Polars (no pandas round-trip, no rechunk)
+  - Theme layers are independent, so they are extracted in a process pool
+    (GDAL's GPKG reads hold the GIL); workers write their Parquet and return
+    only a row count, not the DataFrame
   - Column names have BOM prefix in GPKG that needs cleaning
+  - Layer field lists come from one read of the GPKG's SQLite catalog
+    (gpkg_contents / table_info) instead of opening the file per layer
+  - Themes merge by a single lazy horizontal concat (layers share row order)
+    streamed to disk with sink_parquet; a theme is only realigned by join
+    when its ID_UC_G0 order differs
+  - ucdb_all.parquet is written zstd with explicit row groups and column
+    statistics; it has no geometry, so no bbox covering columns apply
+  - Thematic areas resolve to layers by exact (normalized) name first, with
+    substring matching only as a fallback; each distinct area resolved once
 Date: 2025-12-09
 """
 
 import json
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
+from functools import lru_cache
 from pathlib import Path
 
 import click
-import geopandas as gpd
 import pandas as pd
 import polars as pl
+import pyogrio
 
 from .utils.config import config, get_interim_path, get_raw_path
 
@@ -78,17 +96,68 @@ COMMON_COLUMNS = {
 }
 
 
+# Row group size for ucdb_all.parquet: ~11k cities -> a handful of groups, so
+# readers selecting a few of the ~500 columns get small, prunable chunks
+UCDB_ALL_ROW_GROUP_SIZE = 2048
+
+
+# Normalized thematic area name -> layer key, for exact matching
+_THEMATIC_AREA_LOOKUP = {
+    key.lower().replace("_", " "): value for key, value in THEMATIC_AREA_TO_LAYER.items()
+}
+
+
+@lru_cache(maxsize=None)
+def thematic_area_to_layer(thematic_area: str) -> str | None:
+    """
+    Map an Index "Thematic Area" value to its GeoPackage layer key.
+
+    Exact matches (case/underscore-insensitive) win, so e.g. "GHSL" can't
+    capture an area that merely contains those letters; otherwise the first
+    key contained in the area name is used.
+    """
+    normalized = thematic_area.strip().lower().replace("_", " ")
+    if normalized in _THEMATIC_AREA_LOOKUP:
+        return _THEMATIC_AREA_LOOKUP[normalized]
+    for key, value in THEMATIC_AREA_TO_LAYER.items():
+        if key.lower() in thematic_area.lower():
+            return value
+    return None
+
+
 def clean_column_name(col: str) -> str:
     """Remove BOM character and normalize column names."""
     return col.lstrip("\ufeff").strip()
 
 
+def read_layer_fields(gpkg_path: Path) -> dict[str, list[str]]:
+    """
+    Attribute field names of every layer in a GeoPackage, from one connection.
+
+    Same fields pyogrio.read_info reports (no FID or geometry column), read
+    from the GeoPackage's SQLite catalog so the file is opened once rather
+    than once per layer.
+    """
+    uri = f"{Path(gpkg_path).resolve().as_uri()}?mode=ro"
+    with closing(sqlite3.connect(uri, uri=True)) as con:
+        geometry_columns = dict(
+            con.execute("SELECT table_name, column_name FROM gpkg_geometry_columns")
+        )
+        layers = [name for (name,) in con.execute("SELECT table_name FROM gpkg_contents")]
+        return {
+            layer: [
+                name
+                for _, name, _, _, _, pk in con.execute(f'PRAGMA table_info("{layer}")')
+                if not pk and name != geometry_columns.get(layer)
+            ]
+            for layer in layers
+        }
+
+
 def clean_string_values(df: pl.DataFrame) -> pl.DataFrame:
     """Remove BOM character from all string column values."""
-    for col in df.columns:
-        if df[col].dtype == pl.Utf8:
-            df = df.with_columns(pl.col(col).str.strip_chars("\ufeff").alias(col))
-    return df
+    # One projection over every string column instead of one per column
+    return df.with_columns(pl.col(pl.Utf8).str.strip_chars("\ufeff"))
 
 
 # =============================================================================
@@ -120,7 +189,8 @@ def extract_schema(df: pd.DataFrame) -> dict:
         "columns": {},
     }
 
-    for _, row in df.iterrows():
+    # Plain dicts: iterrows() would build a Series per row
+    for row in df.to_dict("records"):
         attr_id = str(row["Attribute ID"]).strip()
 
         # Clean up indicator name
@@ -137,12 +207,7 @@ def extract_schema(df: pd.DataFrame) -> dict:
 
         # Map thematic area to layer
         thematic_area = row.get("Thematic Area", "")
-        layer = None
-        if thematic_area:
-            for key, value in THEMATIC_AREA_TO_LAYER.items():
-                if key.lower() in str(thematic_area).lower():
-                    layer = value
-                    break
+        layer = thematic_area_to_layer(str(thematic_area)) if thematic_area else None
 
         # Extract source and methodology
         source = row.get("Source")
@@ -187,19 +252,18 @@ def add_layer_info(schema: dict, gpkg_path: Path) -> dict:
     """Add layer information to schema by inspecting the GeoPackage."""
     schema["layers"] = {}
 
+    # Layer metadata only, for all layers from a single open of the file
+    layer_fields = read_layer_fields(gpkg_path)
     for layer_key, layer_name in GPKG_LAYER_NAMES.items():
-        try:
-            # Read just the column names (no data)
-            gdf = gpd.read_file(gpkg_path, layer=layer_name, rows=1)
-            columns = [clean_column_name(c) for c in gdf.columns if c != "geometry"]
-
-            schema["layers"][layer_key] = {
-                "gpkg_name": layer_name,
-                "parquet_file": f"themes/{layer_key.lower()}.parquet",
-                "column_count": len(columns),
-            }
-        except Exception as e:
-            print(f"  Warning: Could not read layer {layer_name}: {e}")
+        if layer_name not in layer_fields:
+            print(f"  Warning: Could not read layer {layer_name}: not in GeoPackage")
+            continue
+
+        schema["layers"][layer_key] = {
+            "gpkg_name": layer_name,
+            "parquet_file": f"themes/{layer_key.lower()}.parquet",
+            "column_count": len(layer_fields[layer_name]),
+        }
 
     return schema
 
@@ -214,7 +278,8 @@ def extract_theme_to_parquet(
     theme: str,
     output_path: Path,
     exclude_common: bool = True,
-) -> pl.DataFrame:
+    layer_fields: list[str] | None = None,
+) -> int:
     """
     Extract a single thematic layer to Parquet (without geometry).
 
@@ -223,28 +288,36 @@ def extract_theme_to_parquet(
         theme: Theme key (e.g., "CLIMATE")
         output_path: Output parquet path
         exclude_common: If True, exclude common columns except ID_UC_G0
+        layer_fields: Raw field names of the layer, if already known
+            (see read_layer_fields); otherwise read from the layer
 
     Returns:
-        Polars DataFrame of the extracted data
+        Number of rows written (small to send back from a worker process,
+        unlike the DataFrame itself)
     """
     layer_name = GPKG_LAYER_NAMES[theme]
     print(f"  Extracting {theme} from {layer_name}...")
 
-    gdf = gpd.read_file(gpkg_path, layer=layer_name)
-
-    # Clean column names
-    gdf.columns = [clean_column_name(c) for c in gdf.columns]
-
-    # Drop geometry
-    df = pd.DataFrame(gdf.drop(columns=["geometry"]))
+    # Raw field names (may carry a BOM prefix) mapped to clean names
+    if layer_fields is None:
+        layer_fields = pyogrio.read_info(gpkg_path, layer=layer_name)["fields"]
+    fields = {field: clean_column_name(field) for field in layer_fields}
 
     # Exclude common columns (except ID_UC_G0) unless this is GENERAL_CHARACTERISTICS
     if exclude_common and theme != "GENERAL_CHARACTERISTICS":
-        cols_to_keep = [c for c in df.columns if c == "ID_UC_G0" or c not in COMMON_COLUMNS]
-        df = df[cols_to_keep]
+        fields = {
+            field: col
+            for field, col in fields.items()
+            if col == "ID_UC_G0" or col not in COMMON_COLUMNS
+        }
 
-    # Convert to Polars
-    pl_df = pl.from_pandas(df)
+    # Read only the kept columns, without geometry, as Arrow. The table arrives
+    # as one chunk per GDAL batch; keep those chunks instead of rechunking so
+    # the Arrow buffers are adopted by Polars without a copy
+    _, table = pyogrio.read_arrow(
+        gpkg_path, layer=layer_name, columns=list(fields), read_geometry=False
+    )
+    pl_df = pl.from_arrow(table, rechunk=False).rename(fields)
 
     # Clean BOM from string values
     pl_df = clean_string_values(pl_df)
@@ -254,14 +327,14 @@ def extract_theme_to_parquet(
     pl_df.write_parquet(output_path)
 
     print(f"    -> {len(pl_df)} rows, {len(pl_df.columns)} columns")
-    return pl_df
+    return len(pl_df)
 
 
 def extract_all_themes(
     gpkg_path: Path,
     output_dir: Path,
     themes: list[str] | None = None,
-) -> dict[str, pl.DataFrame]:
+) -> dict[str, int]:
     """
     Extract all thematic layers to parquet files.
 
@@ -271,7 +344,8 @@ def extract_all_themes(
         themes: List of themes to extract, or None for all
 
     Returns:
-        Dict mapping theme name to DataFrame
+        Dict mapping theme name to rows written (each theme is read back
+        from themes/{theme}.parquet)
     """
     themes_dir = output_dir / "themes"
     themes_dir.mkdir(parents=True, exist_ok=True)
@@ -279,21 +353,35 @@ def extract_all_themes(
     if themes is None:
         themes = list(GPKG_LAYER_NAMES.keys())
 
-    results = {}
+    known_themes = []
     for theme in themes:
         if theme not in GPKG_LAYER_NAMES:
             print(f"  Warning: Unknown theme '{theme}', skipping")
             continue
-
-        output_path = themes_dir / f"{theme.lower()}.parquet"
-        results[theme] = extract_theme_to_parquet(
-            gpkg_path, theme, output_path, exclude_common=True
-        )
-
-    return results
+        known_themes.append(theme)
+    if not known_themes:
+        return {}
+
+    # Field lists for all layers from one catalog read, shared with the workers
+    layer_fields = read_layer_fields(gpkg_path)
+
+    max_workers = min(config.PARALLEL_WORKERS, len(known_themes))
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            theme: executor.submit(
+                extract_theme_to_parquet,
+                gpkg_path,
+                theme,
+                themes_dir / f"{theme.lower()}.parquet",
+                True,
+                layer_fields.get(GPKG_LAYER_NAMES[theme]),
+            )
+            for theme in known_themes
+        }
+        return {theme: future.result() for theme, future in futures.items()}
 
 
-def merge_all_themes(themes_dir: Path, output_path: Path) -> pl.DataFrame:
+def merge_all_themes(themes_dir: Path, output_path: Path) -> pl.LazyFrame:
     """
     Merge all theme Parquets into single wide file joined on ID_UC_G0.
 
@@ -302,7 +390,7 @@ def merge_all_themes(themes_dir: Path, output_path: Path) -> pl.DataFrame:
         output_path: Output path for merged parquet
 
     Returns:
-        Merged Polars DataFrame
+        Lazy scan of the merged parquet
     """
     print("Merging all themes into single wide table...")
 
@@ -311,31 +399,48 @@ def merge_all_themes(themes_dir: Path, output_path: Path) -> pl.DataFrame:
     if not base_path.exists():
         raise FileNotFoundError(f"Base file not found: {base_path}")
 
-    merged = pl.read_parquet(base_path)
-    existing_cols = set(merged.columns)
-    print(f"  Base: {len(merged.columns)} columns from general_characteristics")
+    base = pl.scan_parquet(base_path)
+    existing_cols = set(base.collect_schema().names())
+    # Only the join key is materialized, to check each theme's row alignment
+    base_ids = base.select("ID_UC_G0").collect()
+    print(f"  Base: {len(existing_cols)} columns from general_characteristics")
 
-    # Join other themes
+    # Collect each theme's new columns, then assemble the wide table in one
+    # horizontal concat instead of re-materializing it once per join
+    parts = [base]
     for parquet_file in sorted(themes_dir.glob("*.parquet")):
         if parquet_file.name == "general_characteristics.parquet":
             continue
 
-        df = pl.read_parquet(parquet_file)
-
         # Only keep columns that aren't already in merged (except ID_UC_G0)
-        new_cols = [c for c in df.columns if c == "ID_UC_G0" or c not in existing_cols]
+        theme = pl.scan_parquet(parquet_file)
+        new_cols = [
+            c for c in theme.collect_schema().names() if c == "ID_UC_G0" or c not in existing_cols
+        ]
         if len(new_cols) <= 1:  # Only ID_UC_G0
             print(f"  Skipped {parquet_file.stem} (no new columns)")
             continue
 
-        df = df.select(new_cols)
-        merged = merged.join(df, on="ID_UC_G0", how="left")
+        theme = theme.select(new_cols)
+        # Layers come out of the GPKG in the same row order; only realign
+        # (left join semantics) when a theme's IDs don't match the base
+        theme_ids = theme.select("ID_UC_G0").collect()
+        if not theme_ids["ID_UC_G0"].equals(base_ids["ID_UC_G0"]):
+            theme = base_ids.lazy().join(theme, on="ID_UC_G0", how="left", maintain_order="left")
+        parts.append(theme.drop("ID_UC_G0"))
         existing_cols.update(new_cols)
         print(f"  Added {len(new_cols) - 1} columns from {parquet_file.stem}")
 
-    print(f"  Total: {len(merged.columns)} columns")
-    merged.write_parquet(output_path)
-    return merged
+    print(f"  Total: {len(existing_cols)} columns")
+    # Stream the wide table to disk rather than materializing it first
+    pl.concat(parts, how="horizontal").sink_parquet(
+        output_path,
+        compression="zstd",
+        compression_level=3,
+        statistics=True,
+        row_group_size=UCDB_ALL_ROW_GROUP_SIZE,
+    )
+    return pl.scan_parquet(output_path)
 
 
 # =============================================================================
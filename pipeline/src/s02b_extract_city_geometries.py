@@ -32,16 +32,38 @@ Decision log:
   - Cities that didn't exist in an epoch are simply absent (no NULL rows)
   - Area computed in equal-area projection for accuracy
   - Geometry stored in WGS84 for compatibility with web mapping
+  - Each layer gets at most one transform per target CRS: area uses the
+    source CRS when already Mollweide, and WGS84 reprojection (threaded over
+    the raw coordinate array) is skipped when the source is already WGS84
+  - Epoch layers are extracted in parallel worker processes
+  - Layers read with pyogrio's Arrow path, only the ID column + geometry
+  - Epochs written as GeoParquet parts (public to_parquet writer) as they
+    complete, then copied into geometries_by_epoch.parquet one row group each,
+    instead of concatenated in memory first; the geo metadata (geometry
+    types, bbox) is merged over all epochs
 Date: 2025-12-26
 """
 
+import json
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
 import click
 import geopandas as gpd
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pyogrio
 from tqdm import tqdm
 
 from .utils.config import config, get_interim_path, get_raw_path
-from .utils.geometry_utils import fix_invalid_geometry
+from .utils.geometry_utils import (
+    MOLLWEIDE,
+    WGS84,
+    fix_invalid_geometries,
+    reproject_geometries,
+)
 
 # MTUC epoch layer template
 MTUC_LAYER_TEMPLATE = "GHSL_UCDB_MTUC_{epoch}_GLOBE_R2024"
@@ -53,19 +75,103 @@ MTUC_CENTROID_LAYER = "GHSL_UCDB_MTUC_GLOBE_R2024"
 EPOCHS = [1975, 1980, 1985, 1990, 1995, 2000, 2005, 2010, 2015, 2020, 2025, 2030]
 
 
+def to_wgs84(gdf: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
+    """Reproject a GeoDataFrame to WGS84 using threaded coordinate transforms."""
+    if gdf.crs == WGS84:
+        return gdf
+    geometry = reproject_geometries(gdf.geometry.to_numpy(), gdf.crs, WGS84)
+    return gpd.GeoDataFrame(
+        gdf.drop(columns=gdf.geometry.name),
+        geometry=gpd.GeoSeries(geometry, index=gdf.index),
+        crs=WGS84,
+    )
+
+
+def merge_geo_metadata(schemas: list[pa.Schema]) -> pa.Schema:
+    """
+    Combine the GeoParquet metadata of per-epoch parts into one schema.
+
+    Geometry types are the union over all parts and the bbox covers all of
+    them, so the metadata holds for every epoch, not just the first.
+    """
+    geos = [json.loads(schema.metadata[b"geo"]) for schema in schemas]
+    merged = geos[0]
+    for name, column in merged["columns"].items():
+        parts = [geo["columns"][name] for geo in geos]
+        column["geometry_types"] = sorted({t for part in parts for t in part["geometry_types"]})
+        bboxes = [part["bbox"] for part in parts if "bbox" in part]
+        if bboxes:
+            column["bbox"] = [
+                *(min(bbox[i] for bbox in bboxes) for i in (0, 1)),
+                *(max(bbox[i] for bbox in bboxes) for i in (2, 3)),
+            ]
+    schema = schemas[0]
+    return schema.with_metadata({**schema.metadata, b"geo": json.dumps(merged).encode()})
+
+
+def extract_epoch(mtuc_path: str, epoch: int) -> gpd.GeoDataFrame | None:
+    """
+    Extract one epoch layer from the MTUC GeoPackage.
+
+    Returns:
+        GeoDataFrame with city_id, epoch, geometry, area_km2, or None if the
+        layer could not be read
+    """
+    layer_name = MTUC_LAYER_TEMPLATE.format(epoch=epoch)
+
+    try:
+        # Read epoch layer (ID + geometry only, via the Arrow path)
+        gdf = pyogrio.read_dataframe(
+            mtuc_path, layer=layer_name, columns=["ID_UC_G0"], use_arrow=True
+        )
+    except Exception as e:
+        print(f"  Warning: Could not read layer {layer_name}: {e}")
+        return None
+
+    # Rename ID column
+    gdf = gdf.rename(columns={"ID_UC_G0": "city_id"})
+    gdf["city_id"] = gdf["city_id"].astype(str)
+
+    # Add epoch column
+    gdf["epoch"] = epoch
+
+    # Fix invalid geometries (vectorized; only the invalid subset is repaired)
+    gdf["geometry"] = gpd.GeoSeries(
+        fix_invalid_geometries(gdf.geometry.to_numpy()), index=gdf.index, crs=gdf.crs
+    )
+
+    # Compute area in km² using equal-area projection
+    # Use Mollweide (ESRI:54009) for global equal-area; MTUC is already
+    # stored in Mollweide, so this normally needs no reprojection
+    gdf_equal_area = gdf if gdf.crs == MOLLWEIDE else gdf.to_crs(MOLLWEIDE)
+    gdf["area_km2"] = gdf_equal_area.geometry.area / 1e6  # m² to km²
+
+    # Reproject to WGS84
+    gdf = to_wgs84(gdf)
+
+    # Keep only needed columns
+    return gdf[["city_id", "epoch", "geometry", "area_km2"]]
+
+
 def extract_epoch_geometries(
+    output_path: Path,
     mtuc_path: str | None = None,
     epochs: list[int] | None = None,
-) -> gpd.GeoDataFrame:
+) -> int:
     """
-    Extract epoch-specific geometries from MTUC GeoPackage.
+    Extract epoch-specific geometries from MTUC GeoPackage to GeoParquet.
+
+    Each epoch is written to an uncompressed GeoParquet part as soon as it is
+    extracted, so only one epoch is held in memory at a time; the parts are
+    then copied into the output, one row group each.
 
     Args:
+        output_path: GeoParquet file to write
         mtuc_path: Path to MTUC GeoPackage (default: auto-detect in raw/mtuc)
         epochs: List of epochs to extract (default: all)
 
     Returns:
-        GeoDataFrame with city_id, epoch, geometry, area_km2
+        Number of city-epoch rows written
     """
     # Find MTUC GeoPackage
     if mtuc_path is None:
@@ -82,55 +188,40 @@ def extract_epoch_geometries(
     if epochs is None:
         epochs = EPOCHS
 
-    all_epochs_data = []
-
-    for epoch in tqdm(epochs, desc="Extracting epochs"):
-        layer_name = MTUC_LAYER_TEMPLATE.format(epoch=epoch)
-
-        try:
-            # Read epoch layer
-            gdf = gpd.read_file(mtuc_path, layer=layer_name)
-        except Exception as e:
-            print(f"  Warning: Could not read layer {layer_name}: {e}")
-            continue
-
-        # Rename ID column
-        gdf = gdf.rename(columns={"ID_UC_G0": "city_id"})
-        gdf["city_id"] = gdf["city_id"].astype(str)
-
-        # Add epoch column
-        gdf["epoch"] = epoch
-
-        # Fix invalid geometries
-        invalid_count = (~gdf.geometry.is_valid).sum()
-        if invalid_count > 0:
-            gdf["geometry"] = gdf.geometry.apply(fix_invalid_geometry)
-
-        # Compute area in km² using equal-area projection
-        # Use Mollweide (ESRI:54009) for global equal-area
-        gdf_equal_area = gdf.to_crs("ESRI:54009")
-        gdf["area_km2"] = gdf_equal_area.geometry.area / 1e6  # m² to km²
-
-        # Reproject to WGS84
-        gdf = gdf.to_crs("EPSG:4326")
-
-        # Keep only needed columns
-        gdf = gdf[["city_id", "epoch", "geometry", "area_km2"]]
-
-        all_epochs_data.append(gdf)
-        print(f"  {epoch}: {len(gdf):,} cities")
-
-    # Concatenate all epochs
-    result = gpd.GeoDataFrame(
-        pd.concat(all_epochs_data, ignore_index=True),
-        crs="EPSG:4326",
-    )
-
-    print(f"\nTotal: {len(result):,} city-epoch combinations")
-    print(f"Unique cities: {result['city_id'].nunique():,}")
-    print(f"Epochs: {sorted(result['epoch'].unique())}")
-
-    return result
+    # Epoch layers are independent: read and process them in parallel
+    total_rows = 0
+    city_ids = set()
+    written_epochs = []
+    max_workers = max(1, min(config.PARALLEL_WORKERS, len(epochs)))
+    with tempfile.TemporaryDirectory(dir=output_path.parent) as parts_dir:
+        parts = []
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = executor.map(extract_epoch, [mtuc_path] * len(epochs), epochs)
+            for epoch, gdf in tqdm(zip(epochs, results), total=len(epochs), desc="Extracting epochs"):
+                if gdf is None:
+                    continue
+                part = Path(parts_dir) / f"{epoch}.parquet"
+                gdf.to_parquet(part, index=False, compression=None, write_covering_bbox=True)
+                parts.append(part)
+
+                total_rows += len(gdf)
+                city_ids.update(gdf["city_id"])
+                written_epochs.append(epoch)
+                print(f"  {epoch}: {len(gdf):,} cities")
+
+        if not parts:
+            raise RuntimeError(f"No epoch layers could be read from {mtuc_path}")
+
+        schema = merge_geo_metadata([pq.read_schema(part) for part in parts])
+        with pq.ParquetWriter(output_path, schema, compression="zstd") as writer:
+            for part in parts:
+                writer.write_table(pq.read_table(part).cast(schema))
+
+    print(f"\nTotal: {total_rows:,} city-epoch combinations")
+    print(f"Unique cities: {len(city_ids):,}")
+    print(f"Epochs: {sorted(written_epochs)}")
+
+    return total_rows
 
 
 def extract_centroids(mtuc_path: str | None = None) -> gpd.GeoDataFrame:
@@ -155,15 +246,17 @@ def extract_centroids(mtuc_path: str | None = None) -> gpd.GeoDataFrame:
 
     print(f"Reading centroids from: {mtuc_path}")
 
-    # Read centroid layer
-    gdf = gpd.read_file(mtuc_path, layer=MTUC_CENTROID_LAYER)
+    # Read centroid layer (ID + geometry only, via the Arrow path)
+    gdf = pyogrio.read_dataframe(
+        mtuc_path, layer=MTUC_CENTROID_LAYER, columns=["ID_MTUC_G0"], use_arrow=True
+    )
 
     # Rename ID column (MTUC uses ID_MTUC_G0, not ID_UC_G0)
     gdf = gdf.rename(columns={"ID_MTUC_G0": "city_id"})
     gdf["city_id"] = gdf["city_id"].astype(str)
 
     # Reproject to WGS84
-    gdf = gdf.to_crs("EPSG:4326")
+    gdf = to_wgs84(gdf)
 
     # Keep only needed columns
     gdf = gdf[["city_id", "geometry"]]
@@ -205,14 +298,11 @@ def main(force: bool = False, epochs: str | None = None):
         epochs_list = [int(e.strip()) for e in epochs.split(",")]
         print(f"Extracting epochs: {epochs_list}")
 
-    # Extract epoch geometries
+    # Extract epoch geometries, streamed to disk one epoch at a time
     print("\n--- Extracting Epoch Geometries ---")
-    geom_result = extract_epoch_geometries(epochs=epochs_list)
-
-    # Save epoch geometries
-    print(f"\nSaving to {geom_path}...")
     output_dir.mkdir(parents=True, exist_ok=True)
-    geom_result.to_parquet(geom_path)
+    extract_epoch_geometries(geom_path, epochs=epochs_list)
+    print(f"Saved to {geom_path}")
 
     # Extract centroids
     print("\n--- Extracting Centroids ---")
@@ -220,7 +310,9 @@ def main(force: bool = False, epochs: str | None = None):
 
     # Save centroids
     print(f"Saving to {centroid_path}...")
-    centroid_result.to_parquet(centroid_path)
+    centroid_result.to_parquet(
+        centroid_path, write_covering_bbox=True, row_group_size=5000, compression="zstd"
+    )
 
     # Summary
     print("\n" + "=" * 60)
@@ -233,8 +325,10 @@ def main(force: bool = False, epochs: str | None = None):
 
     # Show sample
     print("\nSample geometries (2025 epoch):")
-    sample = geom_result[geom_result["epoch"] == 2025].head(5)
-    print(sample[["city_id", "epoch", "area_km2"]].to_string(index=False))
+    sample = pd.read_parquet(
+        geom_path, columns=["city_id", "epoch", "area_km2"], filters=[("epoch", "==", 2025)]
+    ).head(5)
+    print(sample.to_string(index=False))
 
 
 if __name__ == "__main__":
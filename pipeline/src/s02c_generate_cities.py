@@ -21,27 +21,56 @@ Output Schema (cities.parquet as GeoParquet):
   | geometry_2025            | Polygon   | geometries_by_epoch.parquet        | City boundary polygon     |
   | centroid_2025            | Point     | centroids_2025.parquet             | Centroid point            |
   | ucdb_population_2025     | int       | GC_POP_TOT_2025                    |                           |
-  | ucdb_area_km2_2025       | float     | GC_UCA_KM2_2025                    |                           |
+  | ucdb_area_km2_2025       | float     | GC_UCA_KM2_2025                    | Geometry area if missing  |
   | bbox_minx/miny/maxx/maxy | float     | geometries_by_epoch.parquet.bounds | From geometries.parquet   |
-  | required_tiles           | list[str] | tile_utils                         | Keep existing logic       |
+  | required_tiles           | list[r,c] | tile_utils                         | struct<r, c: int16> pairs |
 
 Decision log:
   - Separated from s02 to allow independent re-runs
   - Uses interim files instead of raw GeoPackage for faster processing
+  - Interim reads push down columns (and the 2025 epoch filter) into the
+    Parquet scan
   - Converts country names to ISO 3166-1 alpha-3 codes using pycountry
+    (memoized; each distinct name is resolved once). Exact and normalized
+    (accent/punctuation/filler-word insensitive) dict lookups come first;
+    then a prefix match, accepted only when it names a single country, and
+    search_fuzzy as the last resort
+  - MTUC year of birth read via pyogrio column pushdown, without geometry
   - Includes centroid point
+  - city_id is only cast to str when the interim file did not already
+    store it as a string (s02b writes it as Utf8)
+  - Geometry/centroid merges join on a shared categorical city_id and are
+    validated as many-to-one (one geometry/centroid per city)
   - Computes tile coverage for downstream GHSL processing
+  - Bounding boxes via vectorized GeoSeries.bounds and tile coverage via
+    NumPy over the (N, 4) bounds array (no per-row geometry loop)
+  - required_tiles stored as (row, col) int16 struct pairs rather than
+    "R{row}_C{col}" strings; format with tile_utils.format_tile_id if needed
+  - Missing/non-positive UCDB areas fall back to the equal-area (Mollweide)
+    area_km2 that s02b computes for each geometry
+  - country_name, country_code and region written as categoricals so
+    Parquet stores them dictionary-encoded
 Date: 2025-12-11
 """
 
+import re
+import unicodedata
+from functools import lru_cache
+from pathlib import Path
+
 import click
 import geopandas as gpd
+import numpy as np
+import pandas as pd
 import polars as pl
+import pyarrow as pa
+import pyarrow.parquet as pq
 import pycountry
-from tqdm import tqdm
+import pyogrio
+from pandas.api.types import is_string_dtype
 
 from .utils.config import get_interim_path, get_processed_path, get_raw_path
-from .utils.tile_utils import estimate_tiles_for_bbox_wgs84
+from .utils.tile_utils import estimate_tile_indices_for_bboxes_wgs84
 
 
 # Column mappings from UCDB to cities.parquet
@@ -62,7 +91,73 @@ COUNTRY_NAME_OVERRIDES = {
     "Turkey": "TUR",  # pycountry uses "Türkiye"
 }
 
+# Arrow type of required_tiles: (row, col) tile index pairs, 4 bytes per tile
+REQUIRED_TILES_TYPE = pa.list_(pa.struct([("r", pa.int16()), ("c", pa.int16())]))
+
+
+def build_country_lookup() -> dict[str, str]:
+    """
+    Build a lowercase country name -> ISO alpha-3 dict from pycountry.
+
+    Covers name, official_name and common_name (name wins on conflicts),
+    with COUNTRY_NAME_OVERRIDES applied last.
+    """
+    lookup = {}
+    for attr in ("official_name", "common_name", "name"):
+        for country in pycountry.countries:
+            value = getattr(country, attr, None)
+            if value:
+                lookup[value.lower()] = country.alpha_3
+    lookup.update({name.lower(): code for name, code in COUNTRY_NAME_OVERRIDES.items()})
+    return lookup
+
+
+# Exact-name lookup; fuzzy search is only used for names missing here
+COUNTRY_NAME_TO_ISO3 = build_country_lookup()
+
+# Filler words dropped when normalizing country names
+COUNTRY_NAME_STOPWORDS = re.compile(
+    r"\b(the|of|and|de|di|del|da|du|des|republic|islamic|kingdom|democratic)\b"
+)
+
+
+def normalize_country_name(name: str) -> str:
+    """
+    Normalize a country name for lookup.
+
+    Strips accents, case, punctuation and filler words, so e.g.
+    "Côte d'Ivoire" and "Cote d Ivoire" map to the same key.
+    """
+    name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode().lower()
+    name = COUNTRY_NAME_STOPWORDS.sub("", name)
+    name = re.sub(r"[.,()'\-]+", " ", name)
+    return " ".join(name.split())
+
+
+def build_normalized_lookup(lookup: dict[str, str]) -> dict[str, str]:
+    """
+    Re-key a country lookup by normalized name.
+
+    Keys that normalize to the same string for different countries (e.g.
+    "Congo" and "Democratic Republic of the Congo") are left out, so a
+    normalized hit is never ambiguous.
+    """
+    normalized = {}
+    ambiguous = set()
+    for name, code in lookup.items():
+        key = normalize_country_name(name)
+        if normalized.setdefault(key, code) != code:
+            ambiguous.add(key)
+    for key in ambiguous:
+        del normalized[key]
+    return normalized
+
+
+# Normalized-name lookup, tried before falling back to fuzzy search
+COUNTRY_NAME_TO_ISO3_NORMALIZED = build_normalized_lookup(COUNTRY_NAME_TO_ISO3)
+
 
+@lru_cache(maxsize=None)
 def country_name_to_iso3(name: str) -> str | None:
     """
     Convert country name to ISO 3166-1 alpha-3 code using pycountry.
@@ -76,17 +171,38 @@ def country_name_to_iso3(name: str) -> str | None:
     if not name:
         return None
 
-    # Check manual overrides first
-    if name in COUNTRY_NAME_OVERRIDES:
-        return COUNTRY_NAME_OVERRIDES[name]
+    # Exact match (overrides included) via prebuilt dict
+    code = COUNTRY_NAME_TO_ISO3.get(name.lower())
+    if code:
+        return code
 
-    try:
-        # Try exact match first
-        country = pycountry.countries.get(name=name)
-        if country:
-            return country.alpha_3
+    # Accent/punctuation/filler-word insensitive match
+    code = COUNTRY_NAME_TO_ISO3_NORMALIZED.get(normalize_country_name(name))
+    if code:
+        return code
+
+    # Last resort: first fuzzy match for alternate names/spellings
+    return first_fuzzy_match(name)
+
+
+def first_fuzzy_match(name: str) -> str | None:
+    """
+    Return the first plausible fuzzy match for a country name.
+
+    pycountry's search_fuzzy scores every country and subdivision before
+    returning, and has no option to stop early. A cheap prefix match on the
+    normalized names is tried first, but only trusted when every matching
+    name belongs to the same country; otherwise search_fuzzy decides.
+    """
+    query = normalize_country_name(name)
+    if query:
+        prefix_codes = {
+            code for key, code in COUNTRY_NAME_TO_ISO3_NORMALIZED.items() if key.startswith(query)
+        }
+        if len(prefix_codes) == 1:
+            return prefix_codes.pop()
 
-        # Try fuzzy search for alternate names/spellings
+    try:
         results = pycountry.countries.search_fuzzy(name)
         if results:
             return results[0].alpha_3
@@ -96,6 +212,40 @@ def country_name_to_iso3(name: str) -> str | None:
     return None
 
 
+def as_string_ids(ids: pd.Series) -> pd.Series:
+    """Cast city IDs to str unless s02b already wrote them as strings."""
+    return ids if is_string_dtype(ids) else ids.astype(str)
+
+
+def load_year_of_birth(mtuc_path: Path) -> pd.DataFrame | None:
+    """
+    Read city_id and ucdb_year_of_birth from the MTUC GeoPackage.
+
+    Returns:
+        Two-column DataFrame, or None if MTUC has no year-of-birth field
+    """
+    # Inspect the field list, then read just the two needed columns
+    # (no geometry decode)
+    mtuc_fields = pyogrio.read_info(mtuc_path)["fields"]
+    # Column name has trailing space in MTUC: "GC_UCB_YOB _2025"
+    yob_col = [c for c in mtuc_fields if "YOB" in c]
+    if not yob_col:
+        return None
+
+    mtuc_yob = pyogrio.read_dataframe(
+        mtuc_path,
+        columns=["ID_MTUC_G0", yob_col[0]],
+        read_geometry=False,
+        use_arrow=True,
+    )
+    mtuc_yob = mtuc_yob.rename(
+        columns={"ID_MTUC_G0": "city_id", yob_col[0]: "ucdb_year_of_birth"}
+    )
+    mtuc_yob["city_id"] = mtuc_yob["city_id"].astype(str)
+    mtuc_yob["ucdb_year_of_birth"] = mtuc_yob["ucdb_year_of_birth"].astype("Int64")
+    return mtuc_yob
+
+
 def extract_cities(force: bool = False) -> gpd.GeoDataFrame:
     """
     Extract city metadata from UCDB interim files.
@@ -120,48 +270,49 @@ def extract_cities(force: bool = False) -> gpd.GeoDataFrame:
                 "Run 'python -m src.s02_extract_ucdb extract' first."
             )
 
-    ucdb = pl.read_parquet(ucdb_path)
-    geometries = gpd.read_parquet(geom_path)
-    centroids = gpd.read_parquet(centroid_path)
+    # Read only the needed columns (and only the 2025 epoch's row group);
+    # epoch 2025 alone avoids duplicates from geometries_by_epoch
+    geometries_2025 = gpd.read_parquet(
+        geom_path,
+        columns=["city_id", "geometry", "area_km2"],
+        filters=[("epoch", "==", 2025)],
+    )
+    centroids = gpd.read_parquet(centroid_path, columns=["city_id", "geometry"])
 
-    print(f"  UCDB: {len(ucdb)} rows")
-    print(f"  Geometries: {len(geometries)} polygons")
+    print(f"  Geometries (2025): {len(geometries_2025)} polygons")
     print(f"  Centroids: {len(centroids)} points")
 
-    # Select and rename columns
+    # Select, rename and cast columns in one lazy query (column pushdown
+    # into the Parquet scan)
     print("Extracting metadata columns...")
-    source_cols = list(UCDB_COLUMNS.keys())
-    cities_pl = ucdb.select(source_cols).rename(UCDB_COLUMNS)
-
-    # Convert city_id to string
-    cities_pl = cities_pl.with_columns(pl.col("city_id").cast(pl.Utf8))
-
-    # Convert population to integer (handling potential floats)
-    cities_pl = cities_pl.with_columns(
-        pl.col("ucdb_population_2025").cast(pl.Int64)
+    cities_pl = (
+        pl.scan_parquet(ucdb_path)
+        .select(list(UCDB_COLUMNS.keys()))
+        .rename(UCDB_COLUMNS)
+        .with_columns(
+            pl.col("city_id").cast(pl.Utf8),
+            # Population as integer (handling potential floats)
+            pl.col("ucdb_population_2025").cast(pl.Int64),
+            pl.col("ucdb_area_km2_2025").cast(pl.Float64),
+        )
+        .collect()
     )
+    print(f"  UCDB: {len(cities_pl)} rows")
 
-    # Convert area to float
+    # Add ISO country codes (resolved once per distinct country name)
+    print("Converting country names to ISO codes...")
+    codes = {name: country_name_to_iso3(name) for name in cities_pl["country_name"].unique()}
+    failed_countries = {name for name, code in codes.items() if code is None}
+    resolved = {name: code for name, code in codes.items() if code is not None}
     cities_pl = cities_pl.with_columns(
-        pl.col("ucdb_area_km2_2025").cast(pl.Float64)
+        pl.col("country_name")
+        .replace_strict(resolved, default="UNK", return_dtype=pl.Utf8)
+        .alias("country_code")
     )
 
-    # Convert to pandas for merging with geodata
+    # Convert to pandas once, for merging with geodata
     cities_df = cities_pl.to_pandas()
 
-    # Add ISO country codes
-    print("Converting country names to ISO codes...")
-    country_codes = []
-    failed_countries = set()
-
-    for name in tqdm(cities_df["country_name"], desc="  Countries"):
-        code = country_name_to_iso3(name)
-        if code is None:
-            failed_countries.add(name)
-        country_codes.append(code or "UNK")
-
-    cities_df["country_code"] = country_codes
-
     if failed_countries:
         print(f"  Warning: Could not resolve {len(failed_countries)} countries:")
         for name in sorted(failed_countries)[:10]:
@@ -174,15 +325,13 @@ def extract_cities(force: bool = False) -> gpd.GeoDataFrame:
     mtuc_dir = get_raw_path("mtuc")
     mtuc_files = list(mtuc_dir.glob("*.gpkg"))
     if mtuc_files:
-        mtuc_gdf = gpd.read_file(mtuc_files[0])
-        # Column name has trailing space in MTUC: "GC_UCB_YOB _2025"
-        yob_col = [c for c in mtuc_gdf.columns if "YOB" in c]
-        if yob_col:
-            mtuc_yob = mtuc_gdf[["ID_MTUC_G0", yob_col[0]]].copy()
-            mtuc_yob.columns = ["city_id", "ucdb_year_of_birth"]
-            mtuc_yob["city_id"] = mtuc_yob["city_id"].astype(str)
-            mtuc_yob["ucdb_year_of_birth"] = mtuc_yob["ucdb_year_of_birth"].astype("Int64")
-            cities_df = cities_df.merge(mtuc_yob, on="city_id", how="left")
+        mtuc_yob = load_year_of_birth(mtuc_files[0])
+        if mtuc_yob is not None:
+            cities_df = cities_df.merge(
+                mtuc_yob, on="city_id", how="left", sort=False, validate="m:1"
+            )
+            # Only the merged column is needed from here on
+            del mtuc_yob
             print(f"  Added ucdb_year_of_birth for {cities_df['ucdb_year_of_birth'].notna().sum()} cities")
         else:
             print("  Warning: ucdb_year_of_birth column not found in MTUC")
@@ -191,57 +340,66 @@ def extract_cities(force: bool = False) -> gpd.GeoDataFrame:
         print("  Warning: MTUC not found, skipping ucdb_year_of_birth")
         cities_df["ucdb_year_of_birth"] = None
 
-    # Prepare geometries with ID as string for joining
-    geometries = geometries.copy()
-    geometries["city_id"] = geometries["city_id"].astype(str)
+    geometries_2025["city_id"] = as_string_ids(geometries_2025["city_id"])
 
-    centroids = centroids.copy()
-    centroids["city_id"] = centroids["city_id"].astype(str)
     centroids = centroids.rename(columns={"geometry": "centroid_2025"})
+    centroids["city_id"] = as_string_ids(centroids["city_id"])
 
-    # Merge geometry (filter to epoch 2025 to avoid duplicates from geometries_by_epoch)
+    # Shared categorical join key, so merges hash integer codes, not strings
+    city_id_dtype = pd.CategoricalDtype(
+        pd.concat([cities_df["city_id"], geometries_2025["city_id"], centroids["city_id"]]).unique()
+    )
+    cities_df["city_id"] = cities_df["city_id"].astype(city_id_dtype)
+    geometries_2025["city_id"] = geometries_2025["city_id"].astype(city_id_dtype)
+    centroids["city_id"] = centroids["city_id"].astype(city_id_dtype)
+
+    # Merge geometry
     print("Merging with geometries...")
-    geometries_2025 = geometries[geometries["epoch"] == 2025]
     cities_gdf = gpd.GeoDataFrame(
-        cities_df.merge(geometries_2025[["city_id", "geometry"]], on="city_id", how="left"),
+        cities_df.merge(geometries_2025, on="city_id", how="left", sort=False, validate="m:1"),
         geometry="geometry",
         crs="EPSG:4326",
     )
 
+    # Fill missing UCDB areas from the geometry's equal-area area (vectorized)
+    ucdb_area = cities_gdf["ucdb_area_km2_2025"].to_numpy(dtype="float64", na_value=np.nan)
+    cities_gdf["ucdb_area_km2_2025"] = np.where(
+        ucdb_area > 0, ucdb_area, cities_gdf["area_km2"].to_numpy(dtype="float64")
+    )
+
     # Merge centroids
     cities_gdf = cities_gdf.merge(
-        centroids[["city_id", "centroid_2025"]], on="city_id", how="left"
+        centroids, on="city_id", how="left", sort=False, validate="m:1"
     )
+    # Back to plain strings (downstream joins expect a Utf8 city_id)
+    cities_gdf["city_id"] = cities_gdf["city_id"].astype(str)
 
-    # Extract bounding box from geometry
+    # Extract bounding box from geometry (vectorized; NaN for missing/empty)
     print("Extracting bounding boxes...")
-    cities_gdf["bbox_minx"] = cities_gdf.geometry.apply(
-        lambda g: g.bounds[0] if g else None
-    )
-    cities_gdf["bbox_miny"] = cities_gdf.geometry.apply(
-        lambda g: g.bounds[1] if g else None
+    bounds = cities_gdf.geometry.bounds
+    cities_gdf["bbox_minx"] = bounds["minx"]
+    cities_gdf["bbox_miny"] = bounds["miny"]
+    cities_gdf["bbox_maxx"] = bounds["maxx"]
+    cities_gdf["bbox_maxy"] = bounds["maxy"]
+
+    # Compute required tiles over all bboxes at once (NaN bounds -> no tiles)
+    print("Computing tile coverage...")
+    offsets, rows, cols = estimate_tile_indices_for_bboxes_wgs84(
+        bounds[["minx", "miny", "maxx", "maxy"]].to_numpy(dtype="float64")
     )
-    cities_gdf["bbox_maxx"] = cities_gdf.geometry.apply(
-        lambda g: g.bounds[2] if g else None
+    # Arrow list column over the flat arrays (no per-tile Python objects)
+    required_tiles = pa.ListArray.from_arrays(
+        pa.array(offsets, type=pa.int32()),
+        pa.StructArray.from_arrays(
+            [pa.array(rows, type=pa.int16()), pa.array(cols, type=pa.int16())],
+            names=["r", "c"],
+        ),
+        type=REQUIRED_TILES_TYPE,
     )
-    cities_gdf["bbox_maxy"] = cities_gdf.geometry.apply(
-        lambda g: g.bounds[3] if g else None
+    cities_gdf["required_tiles"] = pd.Series(
+        pd.arrays.ArrowExtensionArray(required_tiles), index=cities_gdf.index
     )
 
-    # Compute required tiles
-    print("Computing tile coverage...")
-    required_tiles = []
-    for _, row in tqdm(cities_gdf.iterrows(), total=len(cities_gdf), desc="  Tiles"):
-        if row.geometry:
-            minx, miny, maxx, maxy = row.geometry.bounds
-            tiles = estimate_tiles_for_bbox_wgs84(minx, miny, maxx, maxy)
-            tile_ids = [f"R{r}_C{c}" for r, c in tiles]
-        else:
-            tile_ids = []
-        required_tiles.append(tile_ids)
-
-    cities_gdf["required_tiles"] = required_tiles
-
     # Rename geometry column to geometry_2025
     cities_gdf = cities_gdf.rename(columns={"geometry": "geometry_2025"})
     cities_gdf = cities_gdf.set_geometry("geometry_2025")
@@ -253,15 +411,13 @@ def extract_cities(force: bool = False) -> gpd.GeoDataFrame:
 
     if len(dup_cities) > 0:
         # Log duplicates before removing
-        dup_ids = dup_cities["city_id"].unique()
-        print(f"  Found {len(dup_ids)} city_ids with duplicates ({len(dup_cities)} total rows):")
-        for cid in sorted(dup_ids):
-            rows = dup_cities[dup_cities["city_id"] == cid]
-            entries = ", ".join(
-                f"{r['name']} ({r['country_code']}, pop={r['ucdb_population_2025']:,})"
-                for _, r in rows.iterrows()
-            )
-            print(f"    {cid}: {entries}")
+        entries_by_id = {}
+        dup_rows = dup_cities[["city_id", "name", "country_code", "ucdb_population_2025"]]
+        for cid, name, country_code, pop in dup_rows.itertuples(index=False, name=None):
+            entries_by_id.setdefault(cid, []).append(f"{name} ({country_code}, pop={pop:,})")
+        print(f"  Found {len(entries_by_id)} city_ids with duplicates ({len(dup_cities)} total rows):")
+        for cid in sorted(entries_by_id):
+            print(f"    {cid}: {', '.join(entries_by_id[cid])}")
 
         # Sort by population (desc) then country_code (asc) and keep first
         cities_gdf = cities_gdf.sort_values(
@@ -295,9 +451,41 @@ def extract_cities(force: bool = False) -> gpd.GeoDataFrame:
     ]
     cities_gdf = cities_gdf[column_order]
 
+    # Low-cardinality labels as categoricals (Parquet dictionary encoding)
+    cities_gdf = cities_gdf.astype(
+        {"country_name": "category", "country_code": "category", "region": "category"}
+    )
+
     return cities_gdf
 
 
+def write_cities_parquet(cities_gdf: gpd.GeoDataFrame, output_path: Path) -> None:
+    """
+    Write cities as GeoParquet (covering bbox, zstd, 5000-row row groups).
+
+    pandas records Arrow-backed nested columns with a dtype string
+    ("list<...>[pyarrow]") that it cannot parse on read, so required_tiles
+    is left out of the pandas conversion and added to the Arrow table with
+    REQUIRED_TILES_TYPE as its field type.
+    """
+    # GeoParquet (geo metadata, bbox covering column) from the public writer,
+    # staged uncompressed in memory; the bbox column lets readers skip row
+    # groups by spatial filter
+    staged = pa.BufferOutputStream()
+    cities_gdf.drop(columns="required_tiles").to_parquet(
+        staged, index=False, write_covering_bbox=True, compression="none"
+    )
+    table = pq.read_table(pa.BufferReader(staged.getvalue()))
+
+    required_tiles = pa.array(cities_gdf["required_tiles"].array, type=REQUIRED_TILES_TYPE)
+    table = table.add_column(
+        table.schema.get_field_index("bbox"),
+        pa.field("required_tiles", REQUIRED_TILES_TYPE),
+        required_tiles,
+    )
+    pq.write_table(table, output_path, compression="zstd", row_group_size=5000)
+
+
 @click.command()
 @click.option("--force", is_flag=True, help="Overwrite existing output")
 def main(force: bool = False):
@@ -321,7 +509,7 @@ def main(force: bool = False):
     # Save as GeoParquet
     print(f"\nSaving to {output_path}...")
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    cities_gdf.to_parquet(output_path)
+    write_cities_parquet(cities_gdf, output_path)
 
     # Summary
     print("\n" + "=" * 60)
@@ -31,6 +31,20 @@ Decision log:
   - Only processes H3 cells overlapping city geometries
   - Uses per-epoch city boundaries from geometries_by_epoch.parquet (MTUC)
   - Each H3 cell assigned to primary city (largest intersection area)
+  - Cell/city intersection areas computed per city with vectorized shapely
+    array ops instead of one Polygon + intersection per cell; cells covered
+    by the city skip the intersection. Overlap is kept as the covered
+    fraction of the cell (1.0 for covered cells, so no area is computed)
+  - Primary city picked with one Polars sort + unique over flat
+    (cell, city, overlap) columns rather than per-cell lists and max()
+  - H3 cell polygons (for intersections and exactextract zones) built in
+    batch with shapely.linearrings/polygons, never one Polygon() per cell;
+    each cell's polygon is built once and reused as its exactextract zone.
+    Polygons are not shared across epochs: that would need a sequential
+    pre-pass ahead of the fully parallel epoch containers
+  - exactextract only carries a numeric zone number; h3_index/city_id are
+    joined back in Polars (exactextract has no Arrow output and cannot
+    carry int64 H3 indexes)
   - Cell generation and processing combined in single function (no intermediate files)
   - All 12 epochs processed in parallel (12 containers @ 32GB each)
 
@@ -75,6 +89,28 @@ H3_RESOLUTION = 8
 EPOCH_GEOMETRIES_PARQUET = "data/interim/mtuc/geometries_by_epoch.parquet"
 
 
+def cells_to_polygons(cells: list[str]):
+    """
+    Build WGS84 polygons for H3 cells in one vectorized shapely call.
+
+    Boundaries are ragged (pentagons have 5 vertices), so rings are built
+    from one flat (lng, lat) coordinate array plus per-cell indices.
+
+    Returns:
+        NumPy object array of shapely Polygons, aligned with cells
+    """
+    import h3
+    import numpy as np
+    import shapely
+
+    boundaries = [h3.cell_to_boundary(cell) for cell in cells]
+    counts = np.fromiter((len(b) for b in boundaries), dtype=np.int64, count=len(boundaries))
+    # h3 returns (lat, lng); shapely wants (x=lng, y=lat)
+    coords = np.array([point for b in boundaries for point in b], dtype=np.float64).reshape(-1, 2)
+    rings = shapely.linearrings(coords[:, ::-1], indices=np.repeat(np.arange(len(cells)), counts))
+    return shapely.polygons(rings)
+
+
 @app.function(
     image=image,
     memory=32768,  # 32GB for raster + exactextract + H3 cells
@@ -103,15 +139,15 @@ def process_epoch_full(epoch_geom_bytes: bytes, epoch: int) -> str:
     import io
     import tempfile
     import zipfile
-    from collections import defaultdict
     from pathlib import Path
 
     import geopandas as gpd
     import h3
     import httpx
+    import numpy as np
     import polars as pl
+    import shapely
     from exactextract import exact_extract
-    from shapely import Polygon
 
     print(f"[{epoch}] Starting full processing...")
 
@@ -129,10 +165,15 @@ def process_epoch_full(epoch_geom_bytes: bytes, epoch: int) -> str:
         print(f"[{epoch}] No geometries found for epoch {epoch}")
         return f"No geometries for epoch {epoch}"
 
-    # Generate H3 cells for each city geometry, tracking overlap areas
-    # Map: h3_index -> [(city_id, overlap_area), ...]
+    # Generate H3 cells for each city geometry, tracking overlaps as parallel
+    # (h3_index, city_id, overlap) lists. Overlap is the fraction of the cell
+    # inside the city: the primary city is only ever chosen among overlaps of
+    # the same cell, so this ranks exactly like intersection area
     print(f"[{epoch}] Generating H3 res {H3_RESOLUTION} cells with city associations...")
-    cell_city_overlaps: dict[str, list[tuple[str, float]]] = defaultdict(list)
+    all_cells: list[str] = []
+    all_city_ids: list[str] = []
+    all_overlaps: list[float] = []
+    all_polygons: list = []  # per-city cell polygon arrays, reused for the zones
 
     for idx, row in enumerate(epoch_gdf.itertuples()):
         geometry = row.geometry
@@ -141,47 +182,59 @@ def process_epoch_full(epoch_geom_bytes: bytes, epoch: int) -> str:
         if geometry is None or geometry.is_empty:
             continue
         try:
-            cells = h3.geo_to_cells(geometry, res=H3_RESOLUTION)
-            for cell in cells:
-                # Compute intersection area between H3 cell and city geometry
-                boundary = h3.cell_to_boundary(cell)
-                coords = [(lng, lat) for lat, lng in boundary]
-                coords.append(coords[0])
-                cell_polygon = Polygon(coords)
-
-                intersection = cell_polygon.intersection(geometry)
-                overlap_area = intersection.area if not intersection.is_empty else 0.0
-                cell_city_overlaps[cell].append((city_id, overlap_area))
+            cells = list(h3.geo_to_cells(geometry, res=H3_RESOLUTION))
+            cell_polygons = cells_to_polygons(cells)
+            # Cells covered by the city overlap fully (no area computed at
+            # all); only the boundary cells need a real intersection (covers
+            # is a cheap predicate against the prepared city geometry)
+            shapely.prepare(geometry)
+            boundary = ~shapely.covers(geometry, cell_polygons)
+            overlaps = np.ones(len(cells))
+            boundary_polygons = cell_polygons[boundary]
+            overlaps[boundary] = shapely.area(
+                shapely.intersection(boundary_polygons, geometry)
+            ) / shapely.area(boundary_polygons)
+            all_polygons.append(cell_polygons)
+            all_cells.extend(cells)
+            all_city_ids.extend([city_id] * len(cells))
+            all_overlaps.extend(overlaps.tolist())
         except Exception as e:
             print(f"[{epoch}] Warning: Failed to process city {city_id}: {e}")
             continue
 
         if (idx + 1) % 1000 == 0:
-            print(f"[{epoch}] Processed {idx + 1:,} cities, {len(cell_city_overlaps):,} unique cells")
+            print(f"[{epoch}] Processed {idx + 1:,} cities, {len(all_cells):,} cell-city overlaps")
 
-    print(f"[{epoch}] Total unique H3 cells: {len(cell_city_overlaps):,}")
-
-    # Assign each cell to the city with the largest overlap
+    # Assign each cell to the city with the largest overlap (stable sort, so
+    # ties keep the first city, as before)
     print(f"[{epoch}] Assigning cells to primary cities...")
-    h3_cells = []
-    for i, (cell, city_overlaps) in enumerate(cell_city_overlaps.items()):
-        # Select city with maximum overlap area
-        primary_city_id = max(city_overlaps, key=lambda x: x[1])[0]
-
-        boundary = h3.cell_to_boundary(cell)
-        coords = [(lng, lat) for lat, lng in boundary]
-        coords.append(coords[0])
-        h3_cells.append({
-            "h3_index": cell,
-            "city_id": primary_city_id,
-            "geometry": Polygon(coords),
-        })
-
-        if (i + 1) % 100000 == 0:
-            print(f"[{epoch}] Assigned {i + 1:,} cells")
-
-    # Create GeoDataFrame (in-memory, not saved)
-    h3_cells_gdf = gpd.GeoDataFrame(h3_cells, crs="EPSG:4326")
+    primary_cities = (
+        pl.DataFrame({"h3_index": all_cells, "city_id": all_city_ids, "overlap": all_overlaps})
+        .with_row_index("overlap_row")
+        .sort("overlap", descending=True, maintain_order=True)
+        .unique(subset="h3_index", keep="first", maintain_order=True)
+    )
+    # Polygon of each primary cell, picked from the ones already built above
+    polygons = np.concatenate(all_polygons) if all_polygons else np.empty(0, dtype=object)
+    primary_polygons = polygons[primary_cities["overlap_row"].to_numpy()]
+    del all_cells, all_city_ids, all_overlaps, all_polygons, polygons
+    print(f"[{epoch}] Total unique H3 cells: {len(primary_cities):,}")
+
+    # Cell attributes stay in Polars, keyed by zone (row) number; h3_index
+    # hex strings parsed to int64 natively (H3 indexes fit in 63 bits)
+    cell_attrs = primary_cities.select(
+        pl.col("h3_index").str.to_integer(base=16).cast(pl.Int64),
+        "city_id",
+    ).with_row_index("zone")
+
+    # Create GeoDataFrame (in-memory, not saved); only the numeric zone
+    # number goes through exactextract, so no string columns round-trip
+    # through pandas
+    h3_cells_gdf = gpd.GeoDataFrame(
+        {"zone": np.arange(len(primary_polygons), dtype=np.int32)},
+        geometry=primary_polygons,
+        crs="EPSG:4326",
+    )
     print(f"[{epoch}] Created {len(h3_cells_gdf):,} H3 cell polygons in memory")
 
     # =========================================================================
@@ -218,16 +271,17 @@ def process_epoch_full(epoch_geom_bytes: bytes, epoch: int) -> str:
             str(tif_path),
             h3_cells_gdf,
             ops=["sum"],
-            include_cols=["h3_index", "city_id"],
+            include_cols=["zone"],
             output="pandas",
         )
 
-        # Convert to polars and rename
-        df = pl.from_pandas(results_df).rename({"sum": "population"})
-
-        # Convert h3_index from string back to int64
-        df = df.with_columns(
-            pl.col("h3_index").map_elements(h3.str_to_int, return_dtype=pl.Int64)
+        # Convert the numeric (zone, sum) frame to polars and attach the
+        # cell attributes
+        sums = pl.from_pandas(results_df).select(
+            pl.col("zone").cast(pl.UInt32), pl.col("sum").alias("population")
+        )
+        df = cell_attrs.join(sums, on="zone", how="inner").select(
+            "h3_index", "city_id", "population"
         )
 
         # Filter to positive population
@@ -22,9 +22,13 @@ Decision log:
   - Uses exact H3 cell areas via h3.cell_area() - cells vary 0.55-0.74 km² by latitude
   - Long format output for flexibility in downstream analysis
   - Aggregates from individual epoch files (contain city_id)
+  - Epochs are independent and the per-cell area lookup is CPU-bound, so
+    epochs are processed in parallel worker processes (results keep epoch order)
 Date: 2025-12-26
 """
 
+from concurrent.futures import ProcessPoolExecutor
+
 import click
 import h3
 import polars as pl
@@ -110,12 +114,18 @@ def compute_all_city_populations(epochs: list[int] | None = None) -> pl.DataFram
     print(f"  Filtering to {len(canonical_city_ids):,} canonical UCDB city_ids")
 
     all_pops = []
-    for epoch in epochs:
-        print(f"  Processing epoch {epoch}...")
-        pop_data = compute_city_population_for_epoch(epoch, input_dir, canonical_city_ids)
-        total_pop = pop_data["population"].sum()
-        print(f"    {len(pop_data):,} cities, total pop: {total_pop:,.0f}")
-        all_pops.append(pop_data)
+    max_workers = max(1, min(config.PARALLEL_WORKERS, len(epochs)))
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        results = executor.map(
+            compute_city_population_for_epoch,
+            epochs,
+            [input_dir] * len(epochs),
+            [canonical_city_ids] * len(epochs),
+        )
+        for epoch, pop_data in zip(epochs, results):
+            total_pop = pop_data["population"].sum()
+            print(f"  Epoch {epoch}: {len(pop_data):,} cities, total pop: {total_pop:,.0f}")
+            all_pops.append(pop_data)
 
     return pl.concat(all_pops)
 
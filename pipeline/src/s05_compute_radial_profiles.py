@@ -26,6 +26,8 @@ Decision log:
   - 50 rings at 1km intervals (0-50km max distance)
   - Exact H3 cell areas via h3.cell_area() - varies by latitude
   - Empty rings included with population=0, area=0, density=null
+  - Output built column-wise (per-ring lists + Polars expressions for the
+    derived columns) rather than from a list of per-row dicts
 Date: 2025-12-27
 """
 
@@ -64,7 +66,8 @@ def compute_radial_profiles_for_epoch(epoch: int, input_dir: Path) -> pl.DataFra
     # Get unique cities
     city_ids = h3_pop["city_id"].unique().to_list()
 
-    all_profiles = []
+    num_rings = config.RADIAL_NUM_RINGS
+    columns = {"city_id": [], "ring_index": [], "population": [], "area_km2": [], "cell_count": []}
     for city_id in city_ids:
         city_cells = h3_pop.filter(pl.col("city_id") == city_id)
 
@@ -95,54 +98,40 @@ def compute_radial_profiles_for_epoch(epoch: int, input_dir: Path) -> pl.DataFra
             max_radius_km=config.RADIAL_MAX_DISTANCE_KM,
         )
 
-        # Aggregate each ring
-        for ring_idx in range(config.RADIAL_NUM_RINGS):
+        # Aggregate each ring (empty rings get population=0, area=0)
+        for ring_idx in range(num_rings):
             ring_cells = rings.get(ring_idx, [])
-
-            if len(ring_cells) == 0:
-                # Empty ring
-                all_profiles.append({
-                    "city_id": city_id,
-                    "epoch": epoch,
-                    "ring_index": ring_idx,
-                    "distance_min_km": ring_idx * config.RADIAL_RING_WIDTH_KM,
-                    "distance_max_km": (ring_idx + 1) * config.RADIAL_RING_WIDTH_KM,
-                    "population": 0.0,
-                    "area_km2": 0.0,
-                    "density_per_km2": None,
-                    "cell_count": 0,
-                })
-            else:
-                ring_pop = sum(pop_dict.get(cell, 0) for cell in ring_cells)
-                ring_area = sum(h3_cell_area_km2(cell) for cell in ring_cells)
-                ring_density = ring_pop / ring_area if ring_area > 0 else None
-
-                all_profiles.append({
-                    "city_id": city_id,
-                    "epoch": epoch,
-                    "ring_index": ring_idx,
-                    "distance_min_km": ring_idx * config.RADIAL_RING_WIDTH_KM,
-                    "distance_max_km": (ring_idx + 1) * config.RADIAL_RING_WIDTH_KM,
-                    "population": ring_pop,
-                    "area_km2": ring_area,
-                    "density_per_km2": ring_density,
-                    "cell_count": len(ring_cells),
-                })
-
-    if not all_profiles:
-        return pl.DataFrame(schema={
-            "city_id": pl.Utf8,
-            "epoch": pl.Int64,
+            columns["population"].append(float(sum(pop_dict.get(cell, 0) for cell in ring_cells)))
+            columns["area_km2"].append(float(sum(h3_cell_area_km2(cell) for cell in ring_cells)))
+            columns["cell_count"].append(len(ring_cells))
+        columns["city_id"].extend([city_id] * num_rings)
+        columns["ring_index"].extend(range(num_rings))
+
+    profiles = pl.DataFrame(
+        columns,
+        schema={
+            "city_id": h3_pop.schema["city_id"],
             "ring_index": pl.Int64,
-            "distance_min_km": pl.Float64,
-            "distance_max_km": pl.Float64,
             "population": pl.Float64,
             "area_km2": pl.Float64,
-            "density_per_km2": pl.Float64,
             "cell_count": pl.Int64,
-        })
+        },
+    )
 
-    return pl.DataFrame(all_profiles)
+    ring_width = config.RADIAL_RING_WIDTH_KM
+    return profiles.select(
+        "city_id",
+        pl.lit(epoch, dtype=pl.Int64).alias("epoch"),
+        "ring_index",
+        (pl.col("ring_index") * ring_width).cast(pl.Float64).alias("distance_min_km"),
+        ((pl.col("ring_index") + 1) * ring_width).cast(pl.Float64).alias("distance_max_km"),
+        "population",
+        "area_km2",
+        pl.when(pl.col("area_km2") > 0)
+        .then(pl.col("population") / pl.col("area_km2"))
+        .alias("density_per_km2"),
+        "cell_count",
+    )
 
 
 def compute_all_radial_profiles(epochs: list[int] | None = None) -> pl.DataFrame:
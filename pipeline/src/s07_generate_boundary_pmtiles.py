@@ -177,8 +177,9 @@ def generate_geojson(gdf: gpd.GeoDataFrame, output_path: Path) -> None:
     gdf_export["pop_trend"] = gdf_export["pop_trend"].fillna(0).astype(int)
     gdf_export["density_trend"] = gdf_export["density_trend"].fillna(0).astype(int)
 
-    # Write to GeoJSON
-    gdf_export.to_file(output_path, driver="GeoJSON")
+    # Write to GeoJSON (pyogrio hands the Arrow table to GDAL in batches
+    # instead of converting feature by feature)
+    gdf_export.to_file(output_path, driver="GeoJSON", engine="pyogrio", use_arrow=True)
     file_size = output_path.stat().st_size / 1e6
     print(f"  Wrote {output_path} ({file_size:.1f} MB)")
 
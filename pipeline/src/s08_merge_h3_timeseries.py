@@ -8,6 +8,10 @@ Usage:
   uv run python -m src.s08_merge_h3_timeseries           # Generate and upload
   uv run python -m src.s08_merge_h3_timeseries --local   # Generate only (no upload)
 
+Decision log:
+  - Epoch files are scanned lazily and merged in one group-by pass; only
+    the three needed columns are read and no long-format concat is
+    materialized
 Date: 2025-12-28
 """
 
@@ -32,59 +36,48 @@ def load_and_merge_epochs() -> pl.DataFrame:
     """Load all yearly H3 files and merge into wide format."""
     print(f"Loading H3 population files from {H3_POP_DIR}...")
 
-    # Collect all data in long format first
-    all_data = []
+    # Scan all yearly files lazily (long format, tagged with epoch)
+    scans = []
+    loaded_epochs = []
+    total_rows = 0
     for epoch in EPOCHS:
         file_path = H3_POP_DIR / f"h3_r8_pop_{epoch}.parquet"
         if not file_path.exists():
             print(f"  Warning: {file_path} not found, skipping")
             continue
 
-        df = pl.read_parquet(file_path)
-        df = df.with_columns(pl.lit(epoch).alias("epoch"))
-        all_data.append(df)
-        print(f"  Loaded {epoch}: {len(df):,} cells")
+        scan = pl.scan_parquet(file_path)
+        n_cells = scan.select(pl.len()).collect().item()  # footer metadata only
+        scans.append(
+            scan.select("h3_index", "city_id", "population", pl.lit(epoch).alias("epoch"))
+        )
+        loaded_epochs.append(epoch)
+        total_rows += n_cells
+        print(f"  Found {epoch}: {n_cells:,} cells")
 
-    if not all_data:
+    if not scans:
         raise FileNotFoundError("No H3 population files found")
 
-    # Concatenate all epochs
-    combined = pl.concat(all_data)
-    print(f"\nCombined: {len(combined):,} total rows")
-
-    # Get unique h3_index -> city_id mapping (use most recent city_id for each cell)
-    cell_cities = (
-        combined
-        .sort("epoch", descending=True)
-        .group_by("h3_index")
-        .first()
-        .select(["h3_index", "city_id"])
-    )
+    print(f"\nCombined: {total_rows:,} total rows")
 
-    # Pivot to wide format
+    # Single aggregation pass over all epochs: one pop_YYYY column per epoch
+    # (0 where a cell didn't exist that year) plus the city_id from the most
+    # recent epoch, instead of concat + pivot + a separate city lookup join
     print("Pivoting to wide format...")
-    pivoted = (
-        combined
-        .pivot(
-            on="epoch",
-            index="h3_index",
-            values="population",
+    pop_cols = [f"pop_{e}" for e in loaded_epochs]
+    result = (
+        pl.concat(scans)
+        .group_by("h3_index")
+        .agg(
+            pl.col("city_id").sort_by("epoch").last(),
+            *[
+                pl.col("population").filter(pl.col("epoch") == e).sum().alias(f"pop_{e}")
+                for e in loaded_epochs
+            ],
         )
+        .collect()
     )
 
-    # Rename columns from epoch numbers to pop_YYYY
-    rename_map = {str(e): f"pop_{e}" for e in EPOCHS}
-    pivoted = pivoted.rename(rename_map)
-
-    # Join city_id back
-    result = pivoted.join(cell_cities, on="h3_index", how="left")
-
-    # Fill nulls with 0 (cells that didn't exist in some years)
-    pop_cols = [f"pop_{e}" for e in EPOCHS if f"pop_{e}" in result.columns]
-    result = result.with_columns([
-        pl.col(col).fill_null(0.0) for col in pop_cols
-    ])
-
     # Convert h3_index from int64 to hex string for browser compatibility
     # (JavaScript can't handle int64 values > Number.MAX_SAFE_INTEGER)
     result = result.with_columns(
@@ -17,6 +17,7 @@ from pathlib import Path
 
 import boto3
 import geopandas as gpd
+import numpy as np
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -40,36 +41,39 @@ def generate_city_index(gdf: gpd.GeoDataFrame) -> list[dict]:
     """Generate city index list from GeoDataFrame."""
     print("Generating city index...")
 
+    # Centroid coordinates and bboxes as arrays (vectorized; NaN when missing/empty)
+    centroids = gpd.GeoSeries(gdf["centroid_2025"])
+    centroid_xy = np.column_stack([centroids.x.to_numpy(), centroids.y.to_numpy()])
+    bboxes = gdf[["bbox_minx", "bbox_miny", "bbox_maxx", "bbox_maxy"]].to_numpy(dtype="float64")
+
     cities = []
-    for _, row in gdf.iterrows():
-        # Extract centroid coordinates
-        centroid = row.get("centroid_2025")
-        if centroid is not None and not centroid.is_empty:
-            centroid_coords = [round(centroid.x, 6), round(centroid.y, 6)]
-        else:
-            centroid_coords = None
-
-        # Extract bbox
+    for i, (city_id, name, country, country_code, pop) in enumerate(
+        zip(
+            gdf["city_id"],
+            gdf["name"],
+            gdf["country_name"],
+            gdf["country_code"],
+            gdf["ucdb_population_2025"],
+        )
+    ):
+        centroid_coords = None
+        if not np.isnan(centroid_xy[i]).any():
+            centroid_coords = [round(float(v), 6) for v in centroid_xy[i]]
+
         bbox = None
-        if all(row.get(k) is not None for k in ["bbox_minx", "bbox_miny", "bbox_maxx", "bbox_maxy"]):
-            bbox = [
-                round(row["bbox_minx"], 6),
-                round(row["bbox_miny"], 6),
-                round(row["bbox_maxx"], 6),
-                round(row["bbox_maxy"], 6),
-            ]
+        if not np.isnan(bboxes[i]).any():
+            bbox = [round(float(v), 6) for v in bboxes[i]]
 
         city = {
-            "id": str(row["city_id"]),
-            "name": row["name"],
-            "country": row["country_name"],
-            "country_code": row["country_code"],
+            "id": str(city_id),
+            "name": name,
+            "country": country,
+            "country_code": country_code,
             "centroid": centroid_coords,
             "bbox": bbox,
         }
 
         # Only include population if available
-        pop = row.get("ucdb_population_2025")
         if pop is not None and pop > 0:
             city["population"] = int(pop)
 
@@ -60,6 +60,7 @@ class PipelineConfig(BaseSettings):
     DOWNLOAD_TIMEOUT: int = 600  # seconds
     DOWNLOAD_RETRIES: int = 3
     DOWNLOAD_BACKOFF_FACTOR: float = 2.0
+    DOWNLOAD_CONCURRENCY: int = 4  # Parallel downloads (be polite to JRC servers)
 
     # Memory settings for Apple Silicon
     DASK_MEMORY_LIMIT: str = "12GB"
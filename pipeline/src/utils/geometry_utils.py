@@ -6,11 +6,17 @@ Decision log:
   - GHSL data is in Mollweide (EPSG:54009), need to convert to WGS84 for H3
   - Use pyproj for accurate coordinate transformations
   - Shapely for geometry operations
+  - Bulk reprojection transforms the flat coordinate array in chunks on a
+    thread pool (PROJ releases the GIL) instead of per-geometry transforms
+  - Invalid geometries are repaired with make_valid (not buffer(0), which can
+    drop parts of self-intersecting rings), keeping polygonal output only
 Date: 2025-12-08
 """
 
 import math
+from concurrent.futures import ThreadPoolExecutor
 
+import numpy as np
 import pyproj
 import shapely
 from shapely import Point, Polygon
@@ -36,6 +42,44 @@ def reproject_geometry(
     return shapely_transform(transformer.transform, geometry)
 
 
+def reproject_geometries(
+    geometries: np.ndarray,
+    from_crs: pyproj.CRS,
+    to_crs: pyproj.CRS,
+    max_workers: int = 8,
+) -> np.ndarray:
+    """
+    Reproject an array of shapely geometries between coordinate systems.
+
+    All vertices are pulled into one (N, 2) array, transformed in chunks on a
+    thread pool, and written back into copies of the geometries.
+
+    Args:
+        geometries: Array of shapely geometries (e.g. GeoSeries.to_numpy())
+        from_crs: Source CRS
+        to_crs: Target CRS
+        max_workers: Number of transform threads
+
+    Returns:
+        Array of reprojected geometries, same order as input
+    """
+    coords = shapely.get_coordinates(geometries)
+    if len(coords) == 0:
+        return shapely.set_coordinates(geometries.copy(), coords)
+
+    def transform_chunk(chunk: np.ndarray) -> np.ndarray:
+        # Transformers are not thread-safe: one per chunk
+        transformer = create_transformer(from_crs, to_crs)
+        x, y = transformer.transform(chunk[:, 0], chunk[:, 1])
+        return np.column_stack([x, y])
+
+    chunks = np.array_split(coords, min(max_workers, len(coords)))
+    with ThreadPoolExecutor(max_workers=len(chunks)) as executor:
+        transformed = np.concatenate(list(executor.map(transform_chunk, chunks)))
+
+    return shapely.set_coordinates(geometries.copy(), transformed)
+
+
 def mollweide_to_wgs84(geometry: shapely.Geometry) -> shapely.Geometry:
     """Convert geometry from Mollweide to WGS84."""
     return reproject_geometry(geometry, MOLLWEIDE, WGS84)
@@ -47,10 +91,46 @@ def wgs84_to_mollweide(geometry: shapely.Geometry) -> shapely.Geometry:
 
 
 def fix_invalid_geometry(geometry: shapely.Geometry) -> shapely.Geometry:
-    """Fix invalid geometry using buffer(0) trick."""
-    if not geometry.is_valid:
-        return geometry.buffer(0)
-    return geometry
+    """Fix invalid geometry, keeping only its polygonal parts."""
+    return fix_invalid_geometries(np.array([geometry], dtype=object))[0]
+
+
+def fix_invalid_geometries(geometries: np.ndarray) -> np.ndarray:
+    """
+    Repair invalid geometries with make_valid, only on the invalid subset.
+
+    make_valid keeps every part of a self-intersecting polygon (buffer(0)
+    can silently drop lobes), but may return collapsed lines/points, alone or
+    in a GeometryCollection; those results are reduced to their polygonal
+    parts (an empty MultiPolygon if none remain).
+
+    Returns:
+        Copy of the array with invalid geometries repaired
+    """
+    fixed = geometries.copy()
+    invalid = ~shapely.is_valid(fixed) & ~shapely.is_missing(fixed)
+    if not invalid.any():
+        return fixed
+
+    repaired = shapely.make_valid(fixed[invalid])
+    non_polygonal = ~np.isin(
+        shapely.get_type_id(repaired),
+        [shapely.GeometryType.POLYGON, shapely.GeometryType.MULTIPOLYGON],
+    )
+    if non_polygonal.any():
+        # Flatten collections (and any multipolygons inside them) to single parts
+        parts, index = shapely.get_parts(repaired[non_polygonal], return_index=True)
+        parts, sub_index = shapely.get_parts(parts, return_index=True)
+        index = index[sub_index]
+        polygonal = shapely.get_type_id(parts) == shapely.GeometryType.POLYGON
+        polygons = np.full(non_polygonal.sum(), shapely.from_wkt("MULTIPOLYGON EMPTY"), dtype=object)
+        has_parts = np.unique(index[polygonal])
+        polygons[has_parts] = shapely.multipolygons(
+            parts[polygonal], indices=np.searchsorted(has_parts, index[polygonal])
+        )
+        repaired[non_polygonal] = polygons
+    fixed[invalid] = repaired
+    return fixed
 
 
 def get_bounding_box(geometry: shapely.Geometry) -> tuple[float, float, float, float]:
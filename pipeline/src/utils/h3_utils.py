@@ -5,6 +5,8 @@ Purpose: Common H3 operations used across multiple scripts
 Decision log:
   - Use h3 library (v4+) for core operations
   - h3ronpy for efficient raster-to-H3 conversion
+  - Point-sampling fallback draws and filters all samples with NumPy /
+    shapely.contains_xy; only the H3 lookup stays per point
   - Resolution 9 for maps (~0.1 km²), resolution 10 for profiles (~0.015 km²)
 Date: 2025-12-08 (updated 2025-12-26)
 """
@@ -114,7 +116,7 @@ def polygon_to_h3_cells(polygon, resolution: int) -> set[str]:
 
 def _polygon_to_h3_sampling(polygon, resolution: int, samples_per_km2: int = 100) -> set[str]:
     """Fallback polygon conversion using point sampling."""
-    from shapely.ops import unary_union
+    import shapely
 
     minx, miny, maxx, maxy = polygon.bounds
     area_deg2 = (maxx - minx) * (maxy - miny)
@@ -123,19 +125,15 @@ def _polygon_to_h3_sampling(polygon, resolution: int, samples_per_km2: int = 100
 
     num_samples = int(max(100, area_km2 * samples_per_km2))
 
-    cells = set()
-    for _ in range(num_samples):
-        # Random point in bounding box
-        x = minx + (maxx - minx) * np.random.random()
-        y = miny + (maxy - miny) * np.random.random()
+    # Random points in bounding box, filtered to the polygon in one call
+    x = minx + (maxx - minx) * np.random.random(num_samples)
+    y = miny + (maxy - miny) * np.random.random(num_samples)
+    inside = shapely.contains_xy(polygon, x, y)
 
-        from shapely import Point
-
-        if polygon.contains(Point(x, y)):
-            cell = h3.latlng_to_cell(y, x, resolution)
-            cells.add(cell)
-
-    return cells
+    return {
+        h3.latlng_to_cell(lat, lng, resolution)
+        for lat, lng in zip(y[inside].tolist(), x[inside].tolist())
+    }
 
 
 def get_h3_neighbors(h3_index: int | str) -> set[str]:
@@ -6,10 +6,16 @@ Decision log:
   - JSON format for human-readability and easy debugging
   - Per-item status allows granular restart after failures
   - Automatic timestamping for audit trail
+  - Updates are serialized with a lock so worker threads can share a tracker
+  - Optional save_interval batches rewrites of the JSON file; flush() (also
+    registered atexit) writes any pending updates
 Date: 2025-12-08
 """
 
+import atexit
 import json
+import threading
+import time
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Literal
@@ -32,11 +38,22 @@ class ProgressTracker:
                 tracker.mark_complete(item_id)
             except Exception as e:
                 tracker.mark_failed(item_id, str(e))
+
+    Args:
+        progress_file: JSON checkpoint file
+        save_interval: Minimum seconds between saves triggered by mark_*
+            calls (0 = save on every update). Call flush() at phase ends.
     """
 
-    def __init__(self, progress_file: Path):
+    def __init__(self, progress_file: Path, save_interval: float = 0.0):
         self.file = progress_file
         self.data = self._load()
+        self.save_interval = save_interval
+        self._lock = threading.RLock()
+        self._dirty = False
+        self._last_save = float("-inf")
+        if save_interval > 0:
+            atexit.register(self.flush)
 
     def _load(self) -> dict:
         """Load existing progress or create new."""
@@ -55,13 +72,30 @@ class ProgressTracker:
 
     def save(self) -> None:
         """Save progress to disk."""
-        self.data["updated_at"] = datetime.now(timezone.utc).isoformat()
-        self.file.parent.mkdir(parents=True, exist_ok=True)
-
-        # Write atomically via temp file
-        temp_file = self.file.with_suffix(".tmp")
-        temp_file.write_text(json.dumps(self.data, indent=2))
-        temp_file.rename(self.file)
+        with self._lock:
+            self.data["updated_at"] = datetime.now(timezone.utc).isoformat()
+            self.file.parent.mkdir(parents=True, exist_ok=True)
+
+            # Write atomically via temp file
+            temp_file = self.file.with_suffix(".tmp")
+            temp_file.write_text(json.dumps(self.data, indent=2))
+            temp_file.replace(self.file)
+
+            self._dirty = False
+            self._last_save = time.monotonic()
+
+    def flush(self) -> None:
+        """Save progress if there are updates not yet written."""
+        with self._lock:
+            if self._dirty:
+                self.save()
+
+    def _checkpoint(self) -> None:
+        """Save after an update, unless the last save is under save_interval old."""
+        if time.monotonic() - self._last_save >= self.save_interval:
+            self.save()
+        else:
+            self._dirty = True
 
     def initialize(self, item_ids: list[str], reset: bool = False) -> None:
         """
@@ -89,41 +123,45 @@ class ProgressTracker:
 
     def mark_in_progress(self, item_id: str) -> None:
         """Mark item as currently being processed."""
-        self.data["items"][item_id] = {
-            "status": "in_progress",
-            "started_at": datetime.now(timezone.utc).isoformat(),
-        }
-        self.save()
+        with self._lock:
+            self.data["items"][item_id] = {
+                "status": "in_progress",
+                "started_at": datetime.now(timezone.utc).isoformat(),
+            }
+            self._checkpoint()
 
     def mark_complete(self, item_id: str, metadata: dict | None = None) -> None:
         """Mark item as successfully completed."""
-        self.data["items"][item_id] = {
-            "status": "complete",
-            "completed_at": datetime.now(timezone.utc).isoformat(),
-            **(metadata or {}),
-        }
-        self._update_counts()
-        self.save()
+        with self._lock:
+            self.data["items"][item_id] = {
+                "status": "complete",
+                "completed_at": datetime.now(timezone.utc).isoformat(),
+                **(metadata or {}),
+            }
+            self._update_counts()
+            self._checkpoint()
 
     def mark_failed(self, item_id: str, error: str) -> None:
         """Mark item as failed with error message."""
-        self.data["items"][item_id] = {
-            "status": "failed",
-            "failed_at": datetime.now(timezone.utc).isoformat(),
-            "error": error,
-        }
-        self._update_counts()
-        self.save()
+        with self._lock:
+            self.data["items"][item_id] = {
+                "status": "failed",
+                "failed_at": datetime.now(timezone.utc).isoformat(),
+                "error": error,
+            }
+            self._update_counts()
+            self._checkpoint()
 
     def mark_skipped(self, item_id: str, reason: str = "") -> None:
         """Mark item as skipped."""
-        self.data["items"][item_id] = {
-            "status": "skipped",
-            "skipped_at": datetime.now(timezone.utc).isoformat(),
-            "reason": reason,
-        }
-        self._update_counts()
-        self.save()
+        with self._lock:
+            self.data["items"][item_id] = {
+                "status": "skipped",
+                "skipped_at": datetime.now(timezone.utc).isoformat(),
+                "reason": reason,
+            }
+            self._update_counts()
+            self._checkpoint()
 
     def _update_counts(self) -> None:
         """Update summary counts."""
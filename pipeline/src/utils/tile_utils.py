@@ -5,17 +5,28 @@ Purpose: Handle GHSL tile grid operations and URL construction
 Decision log:
   - GHSL uses a Mollweide-based tile grid
   - Each tile is ~10000x10000 pixels at 100m resolution
-  - Tile IDs are R{row}_C{col} format
+  - Tile IDs are R{row}_C{col} format; formatted IDs are interned (the grid
+    has at most 18 x 36 tiles, shared by thousands of cities)
+  - Batch tile estimation is vectorized over (N, 4) bbox arrays in NumPy and
+    returned as flat (offsets, rows, cols) arrays, skipping per-tile string
+    formatting
 Date: 2025-12-08
 """
 
+import re
+from functools import lru_cache
 from pathlib import Path
 from typing import NamedTuple
 
+import numpy as np
 import shapely
 from shapely import box
 
 
+# Tile ID embedded in GHSL filenames, e.g. "..._V1_0_R5_C19.tif"
+TILE_ID_PATTERN = re.compile(r"R(\d+)_C(\d+)")
+
+
 class TileInfo(NamedTuple):
     """Information about a GHSL tile."""
 
@@ -40,6 +51,7 @@ def parse_tile_id(tile_id: str) -> tuple[int, int]:
     return row, col
 
 
+@lru_cache(maxsize=None)
 def format_tile_id(row: int, col: int) -> str:
     """
     Format row/column to tile ID string.
@@ -65,9 +77,7 @@ def get_tile_from_filename(filename: str) -> TileInfo | None:
         TileInfo or None if not a tile file
     """
     # Look for R{n}_C{n} pattern
-    import re
-
-    match = re.search(r"R(\d+)_C(\d+)", filename)
+    match = TILE_ID_PATTERN.search(filename)
     if match:
         row = int(match.group(1))
         col = int(match.group(2))
@@ -110,53 +120,68 @@ def get_tile_path(directory: Path, row: int, col: int) -> Path | None:
 TILE_SIZE_MOLLWEIDE = 1000000  # ~1000km per tile in Mollweide meters
 
 
-def estimate_tiles_for_bbox_wgs84(
-    minx: float,
-    miny: float,
-    maxx: float,
-    maxy: float,
-) -> list[tuple[int, int]]:
+def estimate_tile_ranges_wgs84(
+    minx: np.ndarray,
+    miny: np.ndarray,
+    maxx: np.ndarray,
+    maxy: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
     """
-    Estimate which GHSL tiles cover a WGS84 bounding box.
+    Estimate the GHSL tile ranges covering arrays of finite WGS84 bboxes.
 
     This is approximate - for accurate results, use the GHSL tile schema.
 
-    Args:
-        minx, miny, maxx, maxy: WGS84 bounding box
-
     Returns:
-        List of (row, col) tuples
+        Inclusive (row_min, row_max, col_min, col_max) integer arrays
     """
-    # Convert to approximate Mollweide coordinates
-    # Mollweide x: -18040000 to +18040000
-    # Mollweide y: -9020000 to +9020000
-
-    # Rough conversion (accurate near equator)
-    def wgs84_to_mollweide_approx(lon: float, lat: float) -> tuple[float, float]:
-        import math
-
-        # Very rough approximation
-        x = lon * 111320 * math.cos(math.radians(lat))
-        y = lat * 110540
-        return x, y
-
-    # Get corners in Mollweide
-    x1, y1 = wgs84_to_mollweide_approx(minx, miny)
-    x2, y2 = wgs84_to_mollweide_approx(maxx, maxy)
-
-    # Convert to tile indices
-    # GHSL grid starts at some offset - these are rough estimates
-    # Tile 0,0 is approximately at the northwest corner
+    # Very rough Mollweide approximation (accurate near the equator); the
+    # grid spans x in +/-18040000 and y in +/-9020000, tile 0,0 at the
+    # northwest corner, rows 0-17 and cols 0-35
+    x1 = minx * 111320 * np.cos(np.radians(miny))
+    y1 = miny * 110540
+    x2 = maxx * 111320 * np.cos(np.radians(maxy))
+    y2 = maxy * 110540
+
+    def to_index(values: np.ndarray, upper: int) -> np.ndarray:
+        return np.clip(np.trunc(values / TILE_SIZE_MOLLWEIDE), 0, upper).astype(np.int64)
+
+    col_min = to_index(x1 + 18040000, 35)
+    col_max = to_index(x2 + 18040000, 35)
+    row_min = to_index(9020000 - y2, 17)
+    row_max = to_index(9020000 - y1, 17)
+    return row_min, row_max, col_min, col_max
+
+
+def estimate_tile_indices_for_bboxes_wgs84(
+    bboxes: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Estimate covering tiles for many WGS84 bboxes as flat index arrays.
 
-    # Approximate grid: rows 0-17, cols 0-35
-    col1 = max(0, min(35, int((x1 + 18040000) / TILE_SIZE_MOLLWEIDE)))
-    col2 = max(0, min(35, int((x2 + 18040000) / TILE_SIZE_MOLLWEIDE)))
-    row1 = max(0, min(17, int((9020000 - y2) / TILE_SIZE_MOLLWEIDE)))
-    row2 = max(0, min(17, int((9020000 - y1) / TILE_SIZE_MOLLWEIDE)))
+    Tiles of each bbox are listed row-major, as integer indices rather than
+    formatted tile ID strings.
 
-    tiles = []
-    for row in range(row1, row2 + 1):
-        for col in range(col1, col2 + 1):
-            tiles.append((row, col))
+    Args:
+        bboxes: (N, 4) array of minx, miny, maxx, maxy; rows containing NaN
+            (missing geometry) get no tiles
 
-    return tiles
+    Returns:
+        (offsets, rows, cols): bbox i covers tiles rows[offsets[i]:offsets[i+1]]
+        and cols[offsets[i]:offsets[i+1]]; offsets has N + 1 entries
+    """
+    valid_idx = np.flatnonzero(~np.isnan(bboxes).any(axis=1))
+    row_min, row_max, col_min, col_max = estimate_tile_ranges_wgs84(*bboxes[valid_idx].T)
+    # Inverted ranges (possible near the poles) cover no tiles
+    n_cols = np.maximum(col_max - col_min + 1, 0)
+    counts = np.maximum(row_max - row_min + 1, 0) * n_cols
+
+    offsets = np.zeros(len(bboxes) + 1, dtype=np.int64)
+    offsets[valid_idx + 1] = counts
+    np.cumsum(offsets, out=offsets)
+
+    # Owning bbox and row-major position within it, for every tile
+    owner = np.repeat(np.arange(len(valid_idx)), counts)
+    local = np.arange(offsets[-1]) - np.repeat(offsets[valid_idx], counts)
+    rows = (row_min[owner] + local // n_cols[owner]).astype(np.int16)
+    cols = (col_min[owner] + local % n_cols[owner]).astype(np.int16)
+    return offsets, rows, cols